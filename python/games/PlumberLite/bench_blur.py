@@ -0,0 +1,53 @@
+import time
+import pygame
+from lighting import BLUR_QUALITY, LightBlur, LightMap
+
+# ---------------------------
+# Compares the old self-blit blur from tilegame.py with the
+# downsampled LightBlur presets on a full-size light map.
+# Run from this folder: python bench_blur.py
+# ---------------------------
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 720
+FRAMES = 200
+LIGHTS = [(200, 200, 120), (600, 360, 200), (1000, 500, 90), (400, 650, 150)]
+
+
+def legacy_blur_surface(surface, amount=2):
+    # The blur tilegame.py used before LightBlur
+    for _ in range(amount):
+        surface.blit(surface, (1,0), special_flags=pygame.BLEND_RGBA_ADD)
+        surface.blit(surface, (-1,0), special_flags=pygame.BLEND_RGBA_ADD)
+        surface.blit(surface, (0,1), special_flags=pygame.BLEND_RGBA_ADD)
+        surface.blit(surface, (0,-1), special_flags=pygame.BLEND_RGBA_ADD)
+    return surface
+
+
+def time_blur(blur_fn, light_map):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        # Re-render each frame, the old blur writes into the light map itself
+        blur_fn(light_map.render(LIGHTS, 0, 0, 200))
+    return (time.perf_counter() - start) * 1000.0 / FRAMES
+
+
+def print_row(name, frame_ms, render_ms):
+    # The render is timed on its own, so a near-free blur can come out a hair
+    # under it; that's noise, not a negative cost
+    print(f"{name:>14} {frame_ms:>10.3f} {max(0.0, frame_ms - render_ms):>10.3f}")
+
+
+def main():
+    light_map = LightMap(SCREEN_WIDTH, SCREEN_HEIGHT)
+    render_ms = time_blur(lambda surf: surf, light_map)
+
+    print(f"{'blur':>14} {'frame ms':>10} {'blur ms':>10}  (light map render alone: {render_ms:.3f} ms)")
+    print_row("legacy x2", time_blur(legacy_blur_surface, light_map), render_ms)
+    for quality in BLUR_QUALITY:
+        blur = LightBlur(SCREEN_WIDTH, SCREEN_HEIGHT, quality)
+        print_row(quality, time_blur(blur.apply, light_map), render_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import math
+import random
+import sys
+import time
+import pygame
+from collision import CollisionWorld
+from maploader import TILE_COLLISION
+
+# ---------------------------
+# Compares the old list-of-Rects collision (one pygame.Rect per solid tile,
+# scanned every move) with CollisionWorld's one-byte-per-tile grid on
+# synthetic maps of growing size, then the old 100-sample grappling hook
+# raycast with CollisionWorld.raycast().
+# Run from this folder: python bench_collision.py
+# ---------------------------
+
+TILE_SIZE = 32
+PLAYER_SIZE = 32
+FRAMES = 200
+MAP_SIZES = [100, 300, 1000]
+SOLID_CHANCE = 0.3
+RAYS = 200
+ROPE_LENGTHS = [100, 300, 1000]
+
+
+def make_flags(size, seed=1):
+    rng = random.Random(seed)
+    flags = bytearray(size * size)
+    for i in range(size * size):
+        if rng.random() < SOLID_CHANCE:
+            flags[i] = TILE_COLLISION
+    return flags
+
+
+def make_rect_list(size, flags):
+    """The old representation: a Rect for every solid tile."""
+    rects = []
+    for i, flag in enumerate(flags):
+        if flag & TILE_COLLISION:
+            y, x = divmod(i, size)
+            rects.append(pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+    return rects
+
+
+def make_moves(size, seed=2):
+    rng = random.Random(seed)
+    max_px = size * TILE_SIZE - PLAYER_SIZE
+    moves = []
+    for _ in range(FRAMES):
+        rect = pygame.Rect(rng.randint(0, max_px), rng.randint(0, max_px), PLAYER_SIZE, PLAYER_SIZE)
+        moves.append((rect, rng.choice([-5, 0, 5]), rng.choice([-5, 0, 5])))
+    return moves
+
+
+def linear_frame(player_rect, dx, dy, rects):
+    # Both passes the way the platformer loops used to do them
+    hit_x = player_rect.move(dx, 0).collidelist(rects) != -1
+    hit_y = player_rect.move(0, dy).collidelist(rects) != -1
+    return hit_x, hit_y
+
+
+def grid_frame(player_rect, dx, dy, world):
+    hit_x = world.overlaps(player_rect.move(dx, 0))
+    hit_y = world.overlaps(player_rect.move(0, dy))
+    return hit_x, hit_y
+
+
+def time_frames(frame_fn, moves, collision, frames):
+    results = []
+    start = time.perf_counter()
+    for rect, dx, dy in moves[:frames]:
+        results.append(frame_fn(rect, dx, dy, collision))
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000.0 / frames, results
+
+
+def sampled_raycast(start_pos, end_pos, rects, steps=100):
+    # raycast_to_collidable() as the rope prototypes used to have it
+    x1, y1 = start_pos
+    x2, y2 = end_pos
+    for i in range(steps + 1):
+        t = i / steps
+        x = x1 + t * (x2 - x1)
+        y = y1 + t * (y2 - y1)
+        point_rect = pygame.Rect(x, y, 1, 1)
+        for crect in rects:
+            if point_rect.colliderect(crect):
+                return (x, y)
+    return None
+
+
+def make_rays(size, length, seed=3):
+    rng = random.Random(seed)
+    rays = []
+    for _ in range(RAYS):
+        start = (rng.uniform(0, size * TILE_SIZE), rng.uniform(0, size * TILE_SIZE))
+        angle = rng.uniform(0, 2 * math.pi)
+        rays.append((start, (start[0] + length * math.cos(angle), start[1] + length * math.sin(angle))))
+    return rays
+
+
+def bench_raycast():
+    # Sparse map so most rays travel a while before hitting something
+    size = 300
+    flags = bytearray(size * size)
+    rng = random.Random(4)
+    for i in range(size * size):
+        if rng.random() < 0.02:
+            flags[i] = TILE_COLLISION
+    rects = make_rect_list(size, flags)
+    world = CollisionWorld(size, size, TILE_SIZE, TILE_SIZE, flags)
+
+    print()
+    print(f"raycast on {size}x{size} ({len(rects)} solid tiles)")
+    print(f"{'length':>8} {'sampled ms/ray':>15} {'DDA ms/ray':>11} {'sampled misses':>15}")
+    for length in ROPE_LENGTHS:
+        rays = make_rays(size, length)
+        sampled_rays = rays[:10]
+        start = time.perf_counter()
+        sampled = [sampled_raycast(a, b, rects) for a, b in sampled_rays]
+        sampled_ms = (time.perf_counter() - start) * 1000.0 / len(sampled_rays)
+        start = time.perf_counter()
+        exact = [world.raycast(a, b) for a, b in rays]
+        dda_ms = (time.perf_counter() - start) * 1000.0 / len(rays)
+        # Rays where sampling stepped straight over a tile the DDA hit
+        tunneled = sum(1 for s, e in zip(sampled, exact) if s is None and e is not None)
+        print(f"{length:>8} {sampled_ms:>15.3f} {dda_ms:>11.4f} {tunneled:>12}/{len(sampled_rays)}")
+
+
+def main():
+    print(f"{'map':>10} {'solid tiles':>12} {'rects MB':>9} {'grid MB':>8} "
+          f"{'linear ms/frame':>16} {'grid ms/frame':>14}")
+    for size in MAP_SIZES:
+        flags = make_flags(size)
+        rects = make_rect_list(size, flags)
+        world = CollisionWorld(size, size, TILE_SIZE, TILE_SIZE, flags)
+        moves = make_moves(size)
+
+        rects_mb = (sys.getsizeof(rects) + len(rects) * sys.getsizeof(pygame.Rect(0, 0, 1, 1))) / 1e6
+        grid_mb = sys.getsizeof(world.flags) / 1e6
+
+        # The linear scan gets slow on big maps, so sample fewer frames there
+        linear_frames = max(5, FRAMES * 100 // size // 10)
+        linear_ms, linear_results = time_frames(linear_frame, moves, rects, linear_frames)
+        grid_ms, grid_results = time_frames(grid_frame, moves, world, FRAMES)
+        assert linear_results == grid_results[:linear_frames], "grid query disagrees with linear scan"
+        print(f"{size:>4}x{size:<5} {len(rects):>12} {rects_mb:>9.2f} {grid_mb:>8.2f} "
+              f"{linear_ms:>16.3f} {grid_ms:>14.4f}")
+    bench_raycast()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import random
+import time
+import pygame
+from tilerender import draw_layers
+
+# ---------------------------
+# Compares the old full-layer render loop from the platformer prototypes
+# with the camera-culled draw_layers() on synthetic maps of growing size.
+# Run from this folder: python bench_render.py
+# ---------------------------
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 720
+TILE_SIZE = 32
+FRAMES = 60
+MAP_SIZES = [100, 300, 1000]
+LAYERS = 3
+FILL_CHANCE = 0.4
+
+
+class BenchLayer:
+    def __init__(self, data):
+        self.data = data
+
+    def __iter__(self):
+        for y, row in enumerate(self.data):
+            for x, gid in enumerate(row):
+                yield x, y, gid
+
+
+class BenchMap:
+    """Just enough of a loaded map for the render loops."""
+
+    def __init__(self, size, seed=1):
+        rng = random.Random(seed)
+        self.width = size
+        self.height = size
+        self.tilewidth = TILE_SIZE
+        self.tileheight = TILE_SIZE
+        self.images = [None]
+        for i in range(8):
+            tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            tile.fill((30 * i, 100, 255 - 30 * i))
+            self.images.append(tile)
+        self.visible_layers = [
+            BenchLayer([[rng.randint(1, 8) if rng.random() < FILL_CHANCE else 0 for _ in range(size)]
+                        for _ in range(size)])
+            for _ in range(LAYERS)
+        ]
+
+    def get_tile_image_by_gid(self, gid):
+        return self.images[gid]
+
+
+def full_layer_frame(screen, tmx_data, camera_x, camera_y):
+    # The loop the prototypes used before draw_layers
+    tiles_drawn = 0
+    for layer in tmx_data.visible_layers:
+        for x, y, gid in layer:
+            if gid != 0:
+                tile_image = tmx_data.get_tile_image_by_gid(gid)
+                if tile_image:
+                    screen.blit(tile_image, (x * TILE_SIZE - camera_x, y * TILE_SIZE - camera_y))
+                    tiles_drawn += 1
+    return tiles_drawn
+
+
+def time_frames(frame_fn, screen, tmx_data, cameras):
+    start = time.perf_counter()
+    for camera_x, camera_y in cameras:
+        frame_fn(screen, tmx_data, camera_x, camera_y)
+    return (time.perf_counter() - start) * 1000.0 / len(cameras)
+
+
+def main():
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{'map':>10} {'full ms/frame':>14} {'culled ms/frame':>16} {'blits/frame':>12}")
+    for size in MAP_SIZES:
+        tmx_data = BenchMap(size)
+        rng = random.Random(2)
+        max_x = size * TILE_SIZE - SCREEN_WIDTH
+        max_y = size * TILE_SIZE - SCREEN_HEIGHT
+        cameras = [(rng.randint(0, max_x), rng.randint(0, max_y)) for _ in range(FRAMES)]
+
+        # The full loop gets very slow on big maps, so sample fewer frames there
+        full_frames = max(3, FRAMES * 100 // size // 5)
+        full_ms = time_frames(full_layer_frame, screen, tmx_data, cameras[:full_frames])
+        culled_ms = time_frames(draw_layers, screen, tmx_data, cameras)
+        blits = draw_layers(screen, tmx_data, *cameras[0])
+        print(f"{size:>4}x{size:<5} {full_ms:>14.3f} {culled_ms:>16.3f} {blits:>12}")
+
+
+if __name__ == "__main__":
+    main()
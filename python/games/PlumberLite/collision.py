@@ -0,0 +1,219 @@
+import math
+import pygame
+from maploader import TILE_CLIMBABLE, TILE_COLLISION
+
+# ---------------------------
+# TILE GRID QUERIES
+# ---------------------------
+
+def cells_overlapping(rect, tile_width, tile_height):
+    """
+    Yields the (x, y) tile coords of every cell that 'rect' overlaps.
+    Touching a cell edge does not count, same as Rect.colliderect.
+    """
+    if rect.width <= 0 or rect.height <= 0:
+        return
+    start_x = rect.left // tile_width
+    end_x = (rect.right - 1) // tile_width
+    start_y = rect.top // tile_height
+    end_y = (rect.bottom - 1) // tile_height
+    for y in range(start_y, end_y + 1):
+        for x in range(start_x, end_x + 1):
+            yield (x, y)
+
+
+def ray_rect_hit(start, end, rect):
+    """
+    Slab test of the segment start -> end against 'rect'.
+    Returns (t, normal) for where the segment enters the rect, t going 0..1
+    along the segment, or None if it misses. A start inside the rect hits at
+    t=0 with a (0, 0) normal.
+    """
+    x0, y0 = start
+    dx = end[0] - x0
+    dy = end[1] - y0
+    t_enter = 0.0
+    t_exit = 1.0
+    normal = (0, 0)
+    for origin, delta, low, high, axis_normal in (
+        (x0, dx, rect.left, rect.right, (-1, 0)),
+        (y0, dy, rect.top, rect.bottom, (0, -1)),
+    ):
+        if delta == 0:
+            if origin < low or origin >= high:
+                return None
+            continue
+        t_low = (low - origin) / delta
+        t_high = (high - origin) / delta
+        side = axis_normal
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+            side = (-axis_normal[0], -axis_normal[1])
+        if t_low > t_enter:
+            t_enter = t_low
+            normal = side
+        t_exit = min(t_exit, t_high)
+        if t_enter > t_exit:
+            return None
+    return t_enter, normal
+
+
+# ---------------------------
+# COLLISION WORLD
+# ---------------------------
+
+class CollisionWorld:
+    """
+    Collision for a whole map: one byte of TILE_* flags per tile in a bytearray,
+    plus the few object-layer rects from Tiled kept per flag.
+    Queries only look at the tiles under the rect, so their cost depends on the
+    size of the rect and not on the size of the map.
+    """
+
+    def __init__(self, width, height, tile_width, tile_height, flags=None, object_rects=None):
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.flags = bytearray(flags) if flags is not None else bytearray(width * height)
+        # flag -> list of Rects from object layers
+        self.object_rects = object_rects or {}
+
+    @classmethod
+    def from_map(cls, tmx_data, exclude_layers=()):
+        """Builds the world from a CompiledMap (see maploader.load_map)."""
+        flags = tmx_data.tile_flags(exclude_layers)
+        object_rects = {
+            TILE_COLLISION: tmx_data.object_rects("collision"),
+            TILE_CLIMBABLE: tmx_data.object_rects("climbable"),
+        }
+        return cls(tmx_data.width, tmx_data.height, tmx_data.tilewidth, tmx_data.tileheight,
+                   flags.tobytes(), object_rects)
+
+    def flag_at(self, x, y):
+        """TILE_* bits of tile (x, y); tiles outside the map are empty."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.flags[y * self.width + x]
+        return 0
+
+    def tile_rect(self, x, y):
+        return pygame.Rect(x * self.tile_width, y * self.tile_height, self.tile_width, self.tile_height)
+
+    def overlaps(self, rect, flag=TILE_COLLISION):
+        """True if 'rect' overlaps any tile or object rect with 'flag' set."""
+        for x, y in cells_overlapping(rect, self.tile_width, self.tile_height):
+            if self.flag_at(x, y) & flag:
+                return True
+        return rect.collidelist(self.object_rects.get(flag, [])) != -1
+
+    def overlapping_rects(self, rect, flag=TILE_COLLISION):
+        """Rects of the tiles and objects with 'flag' set that 'rect' overlaps."""
+        hits = []
+        for x, y in cells_overlapping(rect, self.tile_width, self.tile_height):
+            if self.flag_at(x, y) & flag:
+                hits.append(self.tile_rect(x, y))
+        for obj_rect in self.object_rects.get(flag, []):
+            if rect.colliderect(obj_rect):
+                hits.append(obj_rect)
+        return hits
+
+    def move_x(self, rect, dx, flag=TILE_COLLISION):
+        """
+        Sweeps 'rect' horizontally by 'dx' in steps no bigger than a tile, so fast
+        moves can't skip over a wall. On a hit the rect is left flush against it.
+        Returns True if something was hit.
+        """
+        step = max(1, min(self.tile_width, rect.width))
+        remaining = dx
+        while remaining:
+            move = max(-step, min(step, remaining))
+            rect.x += move
+            hits = self.overlapping_rects(rect, flag)
+            if hits:
+                if move > 0:
+                    rect.right = min(hit.left for hit in hits)
+                else:
+                    rect.left = max(hit.right for hit in hits)
+                return True
+            remaining -= move
+        return False
+
+    def move_y(self, rect, dy, flag=TILE_COLLISION):
+        """Vertical version of move_x. Returns True if something was hit."""
+        step = max(1, min(self.tile_height, rect.height))
+        remaining = dy
+        while remaining:
+            move = max(-step, min(step, remaining))
+            rect.y += move
+            hits = self.overlapping_rects(rect, flag)
+            if hits:
+                if move > 0:
+                    rect.bottom = min(hit.top for hit in hits)
+                else:
+                    rect.top = max(hit.bottom for hit in hits)
+                return True
+            remaining -= move
+        return False
+
+    def raycast(self, start, end, flag=TILE_COLLISION):
+        """
+        Casts a ray from 'start' to 'end' (world pixels) and returns
+        ((hit_x, hit_y), (normal_x, normal_y)) for the first tile or object rect
+        with 'flag' set, or None if the segment is clear.
+        Tiles are walked one cell boundary at a time (Amanatides-Woo), so the
+        cost depends on the tiles crossed and thin walls can't be skipped.
+        """
+        x0, y0 = start
+        dx = end[0] - x0
+        dy = end[1] - y0
+        tw = self.tile_width
+        th = self.tile_height
+        cell_x = int(x0 // tw)
+        cell_y = int(y0 // th)
+
+        best = None
+        if self.flag_at(cell_x, cell_y) & flag:
+            best = (0.0, (0, 0))
+        else:
+            step_x = 1 if dx > 0 else -1 if dx < 0 else 0
+            step_y = 1 if dy > 0 else -1 if dy < 0 else 0
+            # Ray t of the next vertical / horizontal cell boundary, and t per cell
+            if step_x:
+                edge_x = (cell_x + 1) * tw if step_x > 0 else cell_x * tw
+                t_max_x = (edge_x - x0) / dx
+                t_delta_x = tw / abs(dx)
+            else:
+                t_max_x = t_delta_x = math.inf
+            if step_y:
+                edge_y = (cell_y + 1) * th if step_y > 0 else cell_y * th
+                t_max_y = (edge_y - y0) / dy
+                t_delta_y = th / abs(dy)
+            else:
+                t_max_y = t_delta_y = math.inf
+
+            while True:
+                if t_max_x < t_max_y:
+                    t = t_max_x
+                    cell_x += step_x
+                    t_max_x += t_delta_x
+                    normal = (-step_x, 0)
+                else:
+                    t = t_max_y
+                    cell_y += step_y
+                    t_max_y += t_delta_y
+                    normal = (0, -step_y)
+                if t > 1.0:
+                    break
+                if self.flag_at(cell_x, cell_y) & flag:
+                    best = (t, normal)
+                    break
+
+        for obj_rect in self.object_rects.get(flag, []):
+            hit = ray_rect_hit(start, end, obj_rect)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+
+        if best is None:
+            return None
+        t, normal = best
+        return (x0 + dx * t, y0 + dy * t), normal
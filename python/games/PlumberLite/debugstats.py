@@ -0,0 +1,64 @@
+from collections import deque
+
+# ---------------------------
+# DEBUG STATS
+# ---------------------------
+
+class DebugStats:
+    """
+    Keeps the last 'size' frames of debug values (hour, darkness, lights, ...)
+    in a ring buffer. While enabled they can be drawn as an overlay and printed
+    as a log line every 'log_every' frames. While disabled nothing is recorded,
+    so callers should check 'enabled' before gathering their values.
+    """
+
+    def __init__(self, size=240, log_every=120, enabled=False):
+        self.history = deque(maxlen=size)
+        self.log_every = log_every  # 0 => never print
+        self.enabled = enabled
+        self._frames = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.history.clear()
+        self._frames = 0
+
+    def record(self, **values):
+        """Stores one frame of values and prints a sampled log line if it's due."""
+        if not self.enabled:
+            return
+        self.history.append(values)
+        self._frames += 1
+        if self.log_every and self._frames % self.log_every == 0:
+            print(self.format_line(values))
+
+    def average(self, name):
+        """Mean of 'name' over the frames in the buffer."""
+        samples = [frame[name] for frame in self.history if name in frame]
+        if not samples:
+            return 0.0
+        return sum(samples) / len(samples)
+
+    def format_line(self, values):
+        parts = []
+        for name, value in values.items():
+            if isinstance(value, float):
+                parts.append(f"{name}={value:.2f}")
+            else:
+                parts.append(f"{name}={value}")
+        return " ".join(parts)
+
+    def draw(self, surface, font, pos=(10, 50), color=(255,255,0)):
+        """Draws the latest frame's values plus the average frame time."""
+        if not self.enabled or not self.history:
+            return
+        latest = self.history[-1]
+        lines = [self.format_line({name: value}) for name, value in latest.items()]
+        if "frame_ms" in latest:
+            lines.append(f"avg_frame_ms={self.average('frame_ms'):.2f}")
+
+        x, y = pos
+        for line in lines:
+            text = font.render(line, True, color)
+            surface.blit(text, (x, y))
+            y += text.get_height()
@@ -1,7 +1,9 @@
 import pygame
 import sys
 import math
-from pytmx import load_pygame, TiledImageLayer
+from collision import CollisionWorld
+from maploader import TILE_CLIMBABLE, load_map
+from tilerender import draw_layers, draw_tile_layer
 
 # --------------------------------
 # 1) Helper to load frames from separate sheets
@@ -29,41 +31,19 @@ def main():
     background_img = pygame.image.load(r"python\games\PlumberLite\Assets\sky.png").convert()
 
     # 3) Load Tiled map
-    tmx_data = load_pygame(r"python\games\PlumberLite\Assets\TestSet.tmx")
+    tmx_data = load_map(r"python\games\PlumberLite\Assets\TestSet.tmx")
     tile_width = tmx_data.tilewidth
     tile_height = tmx_data.tileheight
     map_width = tmx_data.width    # in tiles
     map_height = tmx_data.height
 
-    collidable_rects = []
-    climbable_rects = []
-    clouds_layer = None
+    # One byte of collision/climbable flags per tile (the Clouds layer never collides)
+    world = CollisionWorld.from_map(tmx_data, exclude_layers=("Clouds",))
 
+    clouds_layer = None
     for layer in tmx_data.visible_layers:
-        if hasattr(layer, 'data'):
-            if layer.name == "Clouds":
-                clouds_layer = layer
-            else:
-                for x, y, gid in layer:
-                    if gid == 0:
-                        continue
-                    tile_props = tmx_data.get_tile_properties_by_gid(gid)
-                    if tile_props:
-                        if tile_props.get("collision") is True:
-                            rect = pygame.Rect(x*tile_width, y*tile_height, tile_width, tile_height)
-                            collidable_rects.append(rect)
-                        if tile_props.get("climbable") is True:
-                            rect = pygame.Rect(x*tile_width, y*tile_height, tile_width, tile_height)
-                            climbable_rects.append(rect)
-        elif hasattr(layer, 'objects'):
-            for obj in layer.objects:
-                props = obj.properties
-                if props.get("collision") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    collidable_rects.append(r)
-                if props.get("climbable") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    climbable_rects.append(r)
+        if hasattr(layer, 'data') and layer.name == "Clouds":
+            clouds_layer = layer
 
     camera_x = 0
     camera_y = 0
@@ -137,11 +117,7 @@ def main():
             player_facing_left = False
 
         # Ladder detection
-        on_ladder = False
-        for lad_rect in climbable_rects:
-            if player_rect.colliderect(lad_rect):
-                on_ladder = True
-                break
+        on_ladder = world.overlaps(player_rect, TILE_CLIMBABLE)
 
         # Jump logic
         if (keys[pygame.K_SPACE] or keys[pygame.K_UP]) and (on_ground or on_ladder):
@@ -163,13 +139,7 @@ def main():
             dy = player_vel_y
 
         # 6) Move & collisions (horizontal)
-        player_rect.x += dx
-        for c_rect in collidable_rects:
-            if player_rect.colliderect(c_rect):
-                if dx > 0:
-                    player_rect.right = c_rect.left
-                elif dx < 0:
-                    player_rect.left = c_rect.right
+        world.move_x(player_rect, dx)
 
         # Boundaries horizontally
         if player_rect.left < 0:
@@ -180,16 +150,9 @@ def main():
 
         # Move & collisions (vertical)
         on_ground = False
-        player_rect.y += dy
-        for c_rect in collidable_rects:
-            if player_rect.colliderect(c_rect):
-                if dy > 0:
-                    player_rect.bottom = c_rect.top
-                    player_vel_y = 0
-                    on_ground = True
-                elif dy < 0:
-                    player_rect.top = c_rect.bottom
-                    player_vel_y = 0
+        if world.move_y(player_rect, dy):
+            player_vel_y = 0
+            on_ground = dy > 0  # landed rather than bumped a ceiling
 
         # Bottom boundary
         bottom_boundary = map_height * tile_height
@@ -328,33 +291,11 @@ def main():
 
         # clouds layer
         if clouds_layer:
-            for x,y,gid in clouds_layer:
-                if gid == 0:
-                    continue
-                tile_img = tmx_data.get_tile_image_by_gid(gid)
-                if tile_img:
-                    tile_px = (x - clouds_offset_x) * tile_width
-                    tile_py = y * tile_height
-                    tile_px_mod = tile_px % (map_width * tile_width)
-                    final_x = tile_px_mod - camera_x
-                    final_y = tile_py - camera_y
-                    screen.blit(tile_img, (final_x, final_y))
-
-        # draw other layers (skip clouds_layer) ...
-        for layer in tmx_data.visible_layers:
-            if layer == clouds_layer:
-                continue
-            if isinstance(layer, TiledImageLayer):
-                if layer.image:
-                    screen.blit(layer.image, (0 - camera_x, 0 - camera_y))
-            elif hasattr(layer, 'data'):
-                for x, y, gid in layer:
-                    if gid != 0:
-                        tile_image = tmx_data.get_tile_image_by_gid(gid)
-                        if tile_image:
-                            tile_px = x*tile_width
-                            tile_py = y*tile_height
-                            screen.blit(tile_image, (tile_px - camera_x, tile_py - camera_y))
+            draw_tile_layer(screen, tmx_data, clouds_layer, camera_x, camera_y,
+                            offset_x=clouds_offset_x * tile_width, wrap=True)
+
+        # draw other layers (skip clouds_layer), culled to the screen
+        draw_layers(screen, tmx_data, camera_x, camera_y, skip=(clouds_layer,))
 
         # Draw the player sprite
         px = player_rect.x - camera_x
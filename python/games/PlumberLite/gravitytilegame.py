@@ -1,6 +1,8 @@
 import pygame
 import sys
-from pytmx import load_pygame, TiledImageLayer
+from collision import CollisionWorld
+from maploader import TILE_CLIMBABLE, load_map
+from tilerender import draw_layers, draw_tile_layer
 
 def main():
     pygame.init()
@@ -15,57 +17,20 @@ def main():
     background_img = pygame.image.load(r"python\games\PlumberLite\Assets\sky.png").convert()
 
     # 2) Load Tiled map for collisions, cloud layer, etc.
-    tmx_data = load_pygame(r"python\games\PlumberLite\Assets\TestSet.tmx")
+    tmx_data = load_map(r"python\games\PlumberLite\Assets\TestSet.tmx")
     tile_width = tmx_data.tilewidth
     tile_height = tmx_data.tileheight
     map_width = tmx_data.width    # in tiles
     map_height = tmx_data.height
 
-    # We'll store collisions in these:
-    collidable_rects = []
-    climbable_rects = []
+    # One byte of collision/climbable flags per tile (the Clouds layer never collides)
+    world = CollisionWorld.from_map(tmx_data, exclude_layers=("Clouds",))
 
     # We'll keep a reference to the "Clouds" tile layer, if you named it that in Tiled
     clouds_layer = None
-
     for layer in tmx_data.visible_layers:
-        if hasattr(layer, 'data'):  # tile layer
-            # Check layer.name to see if it’s "Clouds"
-            if layer.name == "Clouds":
-                clouds_layer = layer
-            else:
-                # normal tile layers (collision, etc.)
-                for x, y, gid in layer:
-                    if gid == 0:
-                        continue
-                    tile_props = tmx_data.get_tile_properties_by_gid(gid)
-                    if tile_props:
-                        if tile_props.get("collision") is True:
-                            rect = pygame.Rect(
-                                x * tile_width,
-                                y * tile_height,
-                                tile_width,
-                                tile_height
-                            )
-                            collidable_rects.append(rect)
-                        if tile_props.get("climbable") is True:
-                            rect = pygame.Rect(
-                                x * tile_width,
-                                y * tile_height,
-                                tile_width,
-                                tile_height
-                            )
-                            climbable_rects.append(rect)
-
-        elif hasattr(layer, 'objects'):
-            for obj in layer.objects:
-                props = obj.properties
-                if props.get("collision") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    collidable_rects.append(r)
-                if props.get("climbable") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    climbable_rects.append(r)
+        if hasattr(layer, 'data') and layer.name == "Clouds":
+            clouds_layer = layer
 
     # Basic camera
     camera_x = 0
@@ -120,11 +85,7 @@ def main():
             dx = current_speed
 
         # Check ladder
-        on_ladder = False
-        for ladder_rect in climbable_rects:
-            if player_rect.colliderect(ladder_rect):
-                on_ladder = True
-                break
+        on_ladder = world.overlaps(player_rect, TILE_CLIMBABLE)
 
         # Jump
         if (keys[pygame.K_SPACE] or keys[pygame.K_UP]) and (on_ground or on_ladder):
@@ -156,13 +117,7 @@ def main():
             dy = player_vel_y
 
         # Move horizontally
-        player_rect.x += dx
-        for rect in collidable_rects:
-            if player_rect.colliderect(rect):
-                if dx > 0:  # right
-                    player_rect.right = rect.left
-                elif dx < 0: # left
-                    player_rect.left = rect.right
+        world.move_x(player_rect, dx)
 
         if player_rect.left < 0:
             player_rect.left = 0
@@ -172,16 +127,9 @@ def main():
 
         # Move vertically
         on_ground = False
-        player_rect.y += dy
-        for rect in collidable_rects:
-            if player_rect.colliderect(rect):
-                if dy > 0: # falling
-                    player_rect.bottom = rect.top
-                    player_vel_y = 0
-                    on_ground = True
-                elif dy < 0: # jumping
-                    player_rect.top = rect.bottom
-                    player_vel_y = 0
+        if world.move_y(player_rect, dy):
+            player_vel_y = 0
+            on_ground = dy > 0  # landed rather than bumped a ceiling
 
         # Bottom boundary
         bottom_boundary = map_height * tile_height
@@ -214,42 +162,13 @@ def main():
         # 1) Draw the universal backdrop image at (0,0), ignoring camera
         screen.blit(background_img, (0, 0))
         
-        # 3) Draw the Clouds layer with offset
+        # 3) Draw the Clouds layer with offset (clouds_offset_x is in tiles, wraps around)
         if clouds_layer is not None:
-            for x, y, gid in clouds_layer:
-                if gid == 0:
-                    continue
-                tile_img = tmx_data.get_tile_image_by_gid(gid)
-                if tile_img:
-                    # Subtract clouds_offset_x in tile coords => shift horizontally
-                    tile_px = (x - clouds_offset_x) * tile_width
-                    tile_py = y * tile_height
-                    # Optional wrap-around
-                    tile_px_mod = tile_px % (map_width * tile_width)
-                    final_x = tile_px_mod - camera_x
-                    final_y = tile_py - camera_y
-                    screen.blit(tile_img, (final_x, final_y))
-
-        # 2) Draw other Tiled layers (NOT the Clouds yet)
-        for layer in tmx_data.visible_layers:
-            # skip the clouds layer if we find it
-            if layer == clouds_layer:
-                continue
-
-            if isinstance(layer, TiledImageLayer):
-                if layer.image:
-                    screen.blit(layer.image, (0 - camera_x, 0 - camera_y))
-            elif hasattr(layer, 'data'):
-                for x, y, gid in layer:
-                    if gid != 0:
-                        tile_image = tmx_data.get_tile_image_by_gid(gid)
-                        if tile_image:
-                            tile_px = x * tile_width
-                            tile_py = y * tile_height
-                            screen.blit(
-                                tile_image,
-                                (tile_px - camera_x, tile_py - camera_y)
-                            )
+            draw_tile_layer(screen, tmx_data, clouds_layer, camera_x, camera_y,
+                            offset_x=clouds_offset_x * tile_width, wrap=True)
+
+        # 2) Draw other Tiled layers (NOT the Clouds), only the tiles on screen
+        draw_layers(screen, tmx_data, camera_x, camera_y, skip=(clouds_layer,))
 
 
         # 4) Draw the player
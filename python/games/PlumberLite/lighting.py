@@ -0,0 +1,208 @@
+import pygame
+
+try:
+    import numpy
+except ImportError:  # the blur falls back to plain smoothscale without it
+    numpy = None
+
+# ---------------------------
+# LIGHT STAMPS
+# ---------------------------
+
+_light_stamps = {}
+
+def get_light_stamp(radius):
+    """
+    Returns the radial gradient used to cut a light out of the darkness.
+    Alpha is highest at the center (darkness almost fully removed) and fades out at 'radius'.
+    Stamps are built once per radius and reused by every light of that size.
+    """
+    stamp = _light_stamps.get(radius)
+    if stamp is None:
+        stamp = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        # Largest circle first so the smaller, stronger ones end up on top
+        for r in range(radius - 1 - (radius - 1) % 2, -1, -2):
+            alpha = int(255 * (1.0 - (r/float(radius))))
+            pygame.draw.circle(stamp, (0,0,0,alpha), (radius, radius), r)
+        _light_stamps[radius] = stamp
+    return stamp
+
+
+# ---------------------------
+# DAY / NIGHT
+# ---------------------------
+
+MAX_DARKNESS = 200
+LUT_STEPS_PER_MINUTE = 10
+
+def extendedDayNightFactor(game_time):
+    """
+    0 => full day, 1 => full night
+    - Day: 8->17 => factor=0
+    - Dusk: 17->20 => 0..1
+    - Night: 20->5 => 1
+    - Dawn: 5->8 => 1..0
+    """
+    hour = (game_time / 60.0) % 24.0
+
+    # Dusk: 17->20 => 0..1
+    if 17.0 <= hour < 20.0:
+        prog = (hour - 17.0)/3.0  # 0..1 over 3 hours
+        return prog
+    # Night: 20->5 => factor=1
+    elif hour >= 20.0 or hour < 5.0:
+        return 1.0
+    # Dawn: 5->8 => 1..0
+    elif 5.0 <= hour < 8.0:
+        dawn_prog = (hour - 5.0)/3.0  # 0..1
+        return 1.0 - dawn_prog
+    # Day: 8->17 => factor=0
+    else:
+        return 0.0
+
+def build_darkness_lut(max_alpha=MAX_DARKNESS, steps_per_minute=LUT_STEPS_PER_MINUTE):
+    """Darkness alpha for every 1/steps_per_minute of a game day."""
+    return bytes(
+        int(max_alpha * extendedDayNightFactor(i / steps_per_minute))
+        for i in range(24 * 60 * steps_per_minute)
+    )
+
+DARKNESS_LUT = build_darkness_lut()
+
+def darkness_alpha(game_time):
+    """Looks up the darkness alpha (0..MAX_DARKNESS) for 'game_time' in minutes."""
+    return DARKNESS_LUT[int(game_time * LUT_STEPS_PER_MINUTE) % len(DARKNESS_LUT)]
+
+
+# ---------------------------
+# BLUR
+# ---------------------------
+
+# quality -> (downscale factor, box blur passes); None disables the blur
+BLUR_QUALITY = {
+    "off": None,
+    "low": (4, 0),
+    "medium": (4, 1),
+    "high": (2, 2),
+}
+
+def box_blur_alpha(surface, passes=1):
+    """
+    Separable 3x3 box blur on the alpha channel of 'surface', in place.
+    Needs numpy; does nothing without it.
+    """
+    if numpy is None or passes <= 0:
+        return
+    alpha = pygame.surfarray.pixels_alpha(surface)
+    acc = alpha.astype(numpy.uint16)
+    for _ in range(passes):
+        padded = numpy.pad(acc, ((1,1),(0,0)), mode="edge")
+        acc = padded[:-2] + padded[1:-1] + padded[2:]
+        padded = numpy.pad(acc, ((0,0),(1,1)), mode="edge")
+        acc = (padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]) // 9
+    alpha[...] = acc
+    del alpha  # unlocks the surface
+
+
+class LightBlur:
+    """
+    Softens the light map by shrinking it, box blurring the small copy and
+    scaling it back up. Both buffers are kept between frames.
+    """
+
+    def __init__(self, width, height, quality="medium"):
+        self.width = width
+        self.height = height
+        self.output = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.small = None
+        self.set_quality(quality)
+
+    def set_quality(self, quality):
+        """Switches to one of the BLUR_QUALITY presets."""
+        self.quality = quality
+        preset = BLUR_QUALITY[quality]
+        if preset is None:
+            self.small = None
+            self.passes = 0
+            return
+        factor, self.passes = preset
+        small_size = (max(1, self.width // factor), max(1, self.height // factor))
+        self.small = pygame.Surface(small_size, pygame.SRCALPHA)
+
+    def apply(self, surface):
+        """Returns the blurred light map (or 'surface' itself when the blur is off)."""
+        if self.small is None:
+            return surface
+        pygame.transform.smoothscale(surface, self.small.get_size(), self.small)
+        box_blur_alpha(self.small, self.passes)
+        pygame.transform.smoothscale(self.small, (self.width, self.height), self.output)
+        return self.output
+
+
+# ---------------------------
+# LIGHT MAP
+# ---------------------------
+
+class LightMap:
+    """
+    Screen-sized darkness overlay that is reused from frame to frame.
+    Only the lights whose radius reaches into the viewport are stamped, and
+    update() only redraws (and re-blurs) when the darkness, the camera or the
+    visible lights change.
+    """
+
+    def __init__(self, width, height, blur_quality="medium"):
+        self.width = width
+        self.height = height
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.blur = LightBlur(width, height, blur_quality)
+        self.visible_lights = 0
+        self.rebuilds = 0
+        self._key = None
+        self._result = None
+
+    def cull(self, light_sources, cx, cy):
+        """Returns the lights whose radius overlaps the viewport at (cx, cy)."""
+        visible = []
+        for light in light_sources:
+            lx, ly, radius = light
+            sx = lx - cx
+            sy = ly - cy
+            if sx + radius <= 0 or sx - radius >= self.width:
+                continue
+            if sy + radius <= 0 or sy - radius >= self.height:
+                continue
+            visible.append(light)
+        return visible
+
+    def render(self, light_sources, cx, cy, dark_alpha):
+        """Refills the darkness and subtracts every visible light from it."""
+        visible = self.cull(light_sources, cx, cy)
+        self._draw(visible, cx, cy, dark_alpha)
+        return self.surface
+
+    def _draw(self, visible, cx, cy, dark_alpha):
+        surf = self.surface
+        surf.fill((0,0,0,dark_alpha))
+        for (lx,ly,radius) in visible:
+            surf.blit(get_light_stamp(radius), (lx - cx - radius, ly - cy - radius), special_flags=pygame.BLEND_RGBA_SUB)
+        self.visible_lights = len(visible)
+
+    def update(self, light_sources, cx, cy, dark_alpha):
+        """
+        Returns the blurred light map for this frame, or None during full day
+        when there is no darkness to draw.
+        """
+        if dark_alpha <= 0:
+            self.visible_lights = 0
+            self._key = None
+            return None
+
+        visible = self.cull(light_sources, cx, cy)
+        key = (dark_alpha, cx, cy, tuple(visible), self.blur.quality)
+        if key != self._key:
+            self._draw(visible, cx, cy, dark_alpha)
+            self._result = self.blur.apply(self.surface)
+            self._key = key
+            self.rebuilds += 1
+        return self._result
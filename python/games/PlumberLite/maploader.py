@@ -0,0 +1,379 @@
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as ElementTree
+import zipfile
+import zlib
+from itertools import chain
+
+import numpy
+import pygame
+from pytmx import TiledImageLayer, TiledMap, TiledObjectGroup
+
+# ---------------------------
+# Compiles a Tiled TMX map into a small .npz next to it (gid arrays per layer,
+# collision/climbable flags, objects and light sources) so later launches can
+# skip the XML parse and the per-tile property walk.
+# ---------------------------
+
+MAP_CACHE_VERSION = 1
+MAP_CACHE_SUFFIX = ".mapcache.npz"
+
+# Per-tile flag bits stored in each layer's flag grid
+TILE_COLLISION = 1
+TILE_CLIMBABLE = 2
+
+
+def cache_path_for(tmx_path):
+    return os.path.splitext(tmx_path)[0] + MAP_CACHE_SUFFIX
+
+
+def load_map(tmx_path, cache_path=None):
+    """
+    Returns a CompiledMap for 'tmx_path'. The TMX is only parsed when the cache
+    is missing or one of the files it was built from has changed.
+    """
+    if cache_path is None:
+        cache_path = cache_path_for(tmx_path)
+    compiled = read_map_cache(tmx_path, cache_path)
+    if compiled is None:
+        compiled = compile_map(tmx_path)
+        write_map_cache(cache_path, compiled)
+    meta, arrays = compiled
+    return CompiledMap(tmx_path, meta, arrays)
+
+
+# ---------------------------
+# CACHE KEY
+# ---------------------------
+
+def _file_hash(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha1": _file_hash(path)}
+
+
+def _dependency_is_fresh(path, key):
+    """Same mtime and size => fresh. Otherwise fall back to comparing the content hash."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_mtime_ns == key["mtime_ns"] and st.st_size == key["size"]:
+        return True
+    return st.st_size == key["size"] and _file_hash(path) == key["sha1"]
+
+
+# ---------------------------
+# COMPILE
+# ---------------------------
+
+def _recording_image_loader(path, colorkey, **kwargs):
+    """
+    Stands in for pytmx's pygame loader. Instead of loading images it records
+    which image file, rect and flip flags pytmx wants for every gid.
+    """
+    def load(rect=None, flags=None):
+        flips = (
+            [bool(flags.flipped_horizontally), bool(flags.flipped_vertically), bool(flags.flipped_diagonally)]
+            if flags else [False, False, False]
+        )
+        return {"path": path, "colorkey": colorkey, "rect": list(rect) if rect else None, "flips": flips}
+    return load
+
+
+def _tileset_sources(tmx_path):
+    """External .tsx files the map refers to, so editing them invalidates the cache."""
+    base = os.path.dirname(tmx_path)
+    root = ElementTree.parse(tmx_path).getroot()
+    sources = []
+    for tileset in root.iter("tileset"):
+        source = tileset.get("source")
+        if source:
+            sources.append(os.path.join(base, source))
+    return sources
+
+
+def _plain(value):
+    """Turns pytmx property values into something json can store."""
+    return json.loads(json.dumps(value, default=str))
+
+
+def _props_flags(props):
+    flags = 0
+    if props:
+        if props.get("collision") is True:
+            flags |= TILE_COLLISION
+        if props.get("climbable") is True:
+            flags |= TILE_CLIMBABLE
+    return flags
+
+
+def compile_map(tmx_path):
+    """Parses the TMX with pytmx and returns (meta, arrays) ready to be cached."""
+    tmx_data = TiledMap(tmx_path, image_loader=_recording_image_loader)
+    base = os.path.dirname(tmx_path) or "."
+
+    # gid -> image record, gid -> flag bits
+    gid_count = len(tmx_data.images)
+    flag_lut = numpy.zeros(gid_count, dtype=numpy.uint8)
+    for gid, props in tmx_data.tile_properties.items():
+        if gid < gid_count:
+            flag_lut[gid] = _props_flags(props)
+
+    image_paths = []
+    images = []
+    for record in tmx_data.images:
+        if not record:
+            images.append(None)
+            continue
+        rel = os.path.relpath(record["path"], base)
+        if rel not in image_paths:
+            image_paths.append(rel)
+        images.append([image_paths.index(rel), record["colorkey"], record["rect"], record["flips"]])
+
+    gid_dtype = numpy.uint16 if gid_count <= 0xFFFF else numpy.uint32
+    arrays = {}
+    layers = []
+    light_sources = []
+    for index, layer in enumerate(tmx_data.layers):
+        entry = {"name": layer.name, "visible": bool(layer.visible)}
+        if hasattr(layer, 'data'):
+            gids = numpy.array(layer.data, dtype=gid_dtype)
+            arrays[f"layer{index}_gids"] = gids
+            arrays[f"layer{index}_flags"] = flag_lut[gids]
+            entry["kind"] = "tiles"
+        elif isinstance(layer, TiledImageLayer):
+            entry["kind"] = "image"
+            entry["x"] = getattr(layer, "x", 0) or 0
+            entry["y"] = getattr(layer, "y", 0) or 0
+            gid = getattr(layer, "gid", 0)
+            entry["image"] = images[gid] if gid and gid < len(images) else None
+        elif isinstance(layer, TiledObjectGroup):
+            entry["kind"] = "objects"
+            entry["objects"] = []
+            for obj in layer:
+                props = _plain(dict(obj.properties))
+                entry["objects"].append({
+                    "id": obj.id, "name": obj.name, "type": getattr(obj, "type", None),
+                    "x": obj.x, "y": obj.y, "width": obj.width, "height": obj.height,
+                    "properties": props,
+                })
+                if "light_source" in props:
+                    light_sources.append((obj.x, obj.y, int(props["light_source"])))
+        else:
+            continue
+        layers.append(entry)
+
+    dependencies = [tmx_path] + _tileset_sources(tmx_path) + [os.path.join(base, p) for p in image_paths]
+    meta = {
+        "version": MAP_CACHE_VERSION,
+        "dependencies": {os.path.relpath(p, base): _file_key(p) for p in dependencies if os.path.exists(p)},
+        "width": tmx_data.width,
+        "height": tmx_data.height,
+        "tilewidth": tmx_data.tilewidth,
+        "tileheight": tmx_data.tileheight,
+        "image_paths": image_paths,
+        "images": images,
+        "tile_properties": {str(gid): _plain(props) for gid, props in tmx_data.tile_properties.items()},
+        "layers": layers,
+        "light_sources": light_sources,
+    }
+    return meta, arrays
+
+
+# ---------------------------
+# READ / WRITE
+# ---------------------------
+
+def write_map_cache(cache_path, compiled):
+    """Writes the compiled map through a temp file so a crash never leaves half a cache."""
+    meta, arrays = compiled
+    tmp_path = cache_path + ".tmp"
+    meta_bytes = numpy.frombuffer(json.dumps(meta).encode("utf-8"), dtype=numpy.uint8)
+    try:
+        with open(tmp_path, "wb") as f:
+            numpy.savez_compressed(f, meta=meta_bytes, **arrays)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # A read-only install just recompiles every launch
+        print(f"Could not write map cache {cache_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_map_cache(tmx_path, cache_path):
+    """Returns (meta, arrays) from the cache, or None if it's missing, stale or corrupt."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with numpy.load(cache_path, allow_pickle=False) as npz:
+            meta = json.loads(npz["meta"].tobytes().decode("utf-8"))
+            if meta.get("version") != MAP_CACHE_VERSION:
+                return None
+            base = os.path.dirname(tmx_path) or "."
+            for rel, key in meta["dependencies"].items():
+                if not _dependency_is_fresh(os.path.join(base, rel), key):
+                    return None
+            arrays = {name: npz[name] for name in npz.files if name != "meta"}
+    except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile, zlib.error):
+        # A truncated or garbled cache is rebuilt from the .tmx
+        return None
+    return meta, arrays
+
+
+# ---------------------------
+# RUNTIME MAP
+# ---------------------------
+
+class MapObject:
+    """An object from a Tiled object layer (same attribute names as pytmx)."""
+
+    def __init__(self, entry):
+        self.id = entry["id"]
+        self.name = entry["name"]
+        self.type = entry["type"]
+        self.x = entry["x"]
+        self.y = entry["y"]
+        self.width = entry["width"]
+        self.height = entry["height"]
+        self.properties = entry["properties"]
+
+
+class MapTileLayer:
+    """A tile layer: 'data' is a (height, width) numpy array of gids, 'flags' the matching TILE_* bits."""
+
+    def __init__(self, entry, data, flags):
+        self.name = entry["name"]
+        self.visible = entry["visible"]
+        self.data = data
+        self.flags = flags
+
+    def __iter__(self):
+        """Yields (x, y, gid) for every non-empty tile."""
+        ys, xs = numpy.nonzero(self.data)
+        for x, y, gid in zip(xs.tolist(), ys.tolist(), self.data[ys, xs].tolist()):
+            yield x, y, gid
+
+
+class MapImageLayer:
+    def __init__(self, entry, image):
+        self.name = entry["name"]
+        self.visible = entry["visible"]
+        self.x = entry["x"]
+        self.y = entry["y"]
+        self.image = image
+
+
+class MapObjectLayer:
+    def __init__(self, entry):
+        self.name = entry["name"]
+        self.visible = entry["visible"]
+        self.objects = [MapObject(obj) for obj in entry["objects"]]
+
+    def __iter__(self):
+        return iter(self.objects)
+
+
+class CompiledMap:
+    """
+    The parts of a pytmx TiledMap the games use, rebuilt from the cache.
+    Tile images are cut from each tileset image once, only for gids the map uses.
+    """
+
+    def __init__(self, tmx_path, meta, arrays):
+        self.filename = tmx_path
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.tilewidth = meta["tilewidth"]
+        self.tileheight = meta["tileheight"]
+        self.light_sources = [tuple(light) for light in meta["light_sources"]]
+        self.tile_properties = {int(gid): props for gid, props in meta["tile_properties"].items()}
+
+        self._base = os.path.dirname(tmx_path) or "."
+        self._image_paths = meta["image_paths"]
+        self._sheets = {}
+        self.images = [self._load_tile_image(image) for image in meta["images"]]
+
+        self.layers = []
+        for index, entry in enumerate(meta["layers"]):
+            kind = entry["kind"]
+            if kind == "tiles":
+                layer = MapTileLayer(entry, arrays[f"layer{index}_gids"], arrays[f"layer{index}_flags"])
+            elif kind == "image":
+                layer = MapImageLayer(entry, self._load_tile_image(entry["image"]))
+            else:
+                layer = MapObjectLayer(entry)
+            self.layers.append(layer)
+        self._sheets.clear()
+
+    def _load_tile_image(self, image):
+        if image is None:
+            return None
+        path_index, colorkey, rect, flips = image
+        sheet = self._sheets.get(path_index)
+        if sheet is None:
+            sheet = pygame.image.load(os.path.join(self._base, self._image_paths[path_index]))
+            self._sheets[path_index] = sheet
+
+        tile = sheet.subsurface(rect) if rect else sheet.copy()
+        flipped_h, flipped_v, flipped_d = flips
+        if flipped_d:
+            tile = pygame.transform.flip(pygame.transform.rotate(tile, 270), True, False)
+        if flipped_h or flipped_v:
+            tile = pygame.transform.flip(tile, flipped_h, flipped_v)
+
+        if pygame.display.get_surface() is None:
+            return tile.copy()
+        if colorkey:
+            tile = tile.convert()
+            tile.set_colorkey(pygame.Color(f"#{colorkey}"), pygame.RLEACCEL)
+            return tile
+        # Fully opaque tiles blit faster without per-pixel alpha
+        width, height = tile.get_size()
+        if pygame.mask.from_surface(tile, 254).count() == width * height:
+            return tile.convert()
+        return tile.convert_alpha()
+
+    @property
+    def visible_layers(self):
+        return (layer for layer in self.layers if layer.visible)
+
+    @property
+    def objectgroups(self):
+        return [layer for layer in self.layers if isinstance(layer, MapObjectLayer)]
+
+    @property
+    def objects(self):
+        return chain(*self.objectgroups)
+
+    def get_tile_image_by_gid(self, gid):
+        return self.images[gid]
+
+    def get_tile_properties_by_gid(self, gid):
+        return self.tile_properties.get(gid)
+
+    def tile_flags(self, exclude_layers=()):
+        """TILE_* bits of every visible tile layer OR'd together, as a (height, width) array."""
+        flags = numpy.zeros((self.height, self.width), dtype=numpy.uint8)
+        for layer in self.visible_layers:
+            if isinstance(layer, MapTileLayer) and layer.name not in exclude_layers:
+                flags |= layer.flags
+        return flags
+
+    def object_rects(self, prop):
+        """Rects of the objects on visible object layers whose 'prop' property is True."""
+        rects = []
+        for layer in self.visible_layers:
+            if isinstance(layer, MapObjectLayer):
+                for obj in layer:
+                    if obj.properties.get(prop) is True:
+                        rects.append(pygame.Rect(obj.x, obj.y, obj.width, obj.height))
+        return rects
@@ -1,7 +1,9 @@
 import pygame
 import sys
 import math
-from pytmx import load_pygame, TiledImageLayer
+from collision import CollisionWorld
+from maploader import TILE_CLIMBABLE, load_map
+from tilerender import draw_layers
 
 # ---------------------------
 # HELPER FUNCTIONS
@@ -23,27 +25,6 @@ def clamp_point(origin, target, max_dist):
         ty = oy + dy * ratio
     return (tx, ty)
 
-def raycast_to_collidable(start_pos, end_pos, collidable_rects, steps=100):
-    """
-    Naive line-cast from start_pos -> end_pos.
-    Returns the first collision point or None if no hit.
-    Subdivides the line into 'steps' and checks collisions at each step.
-    """
-    x1, y1 = start_pos
-    x2, y2 = end_pos
-    for i in range(steps + 1):
-        t = i / steps
-        x = x1 + t * (x2 - x1)
-        y = y1 + t * (y2 - y1)
-        # A tiny rect to represent the point
-        point_rect = pygame.Rect(x, y, 1, 1)
-        for crect in collidable_rects:
-            if point_rect.colliderect(crect):
-                # Return collision point
-                return (x, y)
-    # No hit
-    return None
-
 def apply_rope_constraint(player_rect, anchor_pos, rope_length):
     """
     Force the player's center to remain within 'rope_length' distance of 'anchor_pos'.
@@ -72,51 +53,15 @@ def main():
     clock = pygame.time.Clock()
 
     # 1) Load your Tiled map
-    tmx_data = load_pygame(r"python\games\PlumberLite\Assets\TestSet.tmx")
+    tmx_data = load_map(r"python\games\PlumberLite\Assets\TestSet.tmx")
 
     tile_width = tmx_data.tilewidth
     tile_height = tmx_data.tileheight
     map_width = tmx_data.width   # number of tiles horizontally
     map_height = tmx_data.height # number of tiles vertically
 
-    # 2) Build lists for "collidable" rects (solid ground) and "climbable" rects (ladders)
-    collidable_rects = []
-    climbable_rects = []
-
-    for layer in tmx_data.visible_layers:
-        if hasattr(layer, 'data'):  # Tile layer
-            for x, y, gid in layer:
-                if gid == 0:
-                    continue
-                tile_props = tmx_data.get_tile_properties_by_gid(gid)
-                if tile_props:
-                    if tile_props.get("collision") is True:
-                        rect = pygame.Rect(
-                            x * tile_width,
-                            y * tile_height,
-                            tile_width,
-                            tile_height
-                        )
-                        collidable_rects.append(rect)
-                    if tile_props.get("climbable") is True:
-                        rect = pygame.Rect(
-                            x * tile_width,
-                            y * tile_height,
-                            tile_width,
-                            tile_height
-                        )
-                        climbable_rects.append(rect)
-        elif hasattr(layer, 'objects'):  # Object layer
-            for obj in layer.objects:
-                props = obj.properties
-                # collision object
-                if props.get("collision") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    collidable_rects.append(r)
-                # ladder object
-                if props.get("climbable") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    climbable_rects.append(r)
+    # 2) Collision grid: solid ground and climbable (ladder) flags per tile
+    world = CollisionWorld.from_map(tmx_data)
 
     # 3) Basic camera setup
     camera_x = 0
@@ -173,12 +118,9 @@ def main():
                     clamped_target = clamp_point(player_center, (world_mx, world_my), MAX_ROPE_DIST)
 
                     # Now do a raycast from the player to clamped_target
-                    hit_point = raycast_to_collidable(
-                        player_center, 
-                        clamped_target, 
-                        collidable_rects
-                    )
-                    if hit_point:
+                    hit = world.raycast(player_center, clamped_target)
+                    if hit:
+                        hit_point = hit[0]  # hit[1] is the surface normal
                         # Attach the rope
                         rope_active = True
                         rope_anchor = hit_point
@@ -208,11 +150,7 @@ def main():
             dx = current_speed
 
         # Check if on ladder
-        on_ladder = False
-        for ladder_rect in climbable_rects:
-            if player_rect.colliderect(ladder_rect):
-                on_ladder = True
-                break
+        on_ladder = world.overlaps(player_rect, TILE_CLIMBABLE)
 
         # Jumping logic (jump if on ground OR on a ladder)
         if (keys[pygame.K_SPACE] or keys[pygame.K_UP]) and (on_ground or on_ladder):
@@ -249,14 +187,8 @@ def main():
             dy = player_vel_y
 
         # --- MOVE THE PLAYER (HORIZONTAL FIRST) ---
-        player_rect.x += dx
         # Collision checks horizontally
-        for rect in collidable_rects:
-            if player_rect.colliderect(rect):
-                if dx > 0:  # moving right
-                    player_rect.right = rect.left
-                elif dx < 0:  # moving left
-                    player_rect.left = rect.right
+        world.move_x(player_rect, dx)
 
         # Horizontal boundary clamp
         if player_rect.left < 0:
@@ -267,16 +199,9 @@ def main():
 
         # --- MOVE THE PLAYER (VERTICAL) ---
         on_ground = False
-        player_rect.y += dy
-        for rect in collidable_rects:
-            if player_rect.colliderect(rect):
-                if dy > 0:  # falling down
-                    player_rect.bottom = rect.top
-                    player_vel_y = 0
-                    on_ground = True
-                elif dy < 0:  # jumping up
-                    player_rect.top = rect.bottom
-                    player_vel_y = 0
+        if world.move_y(player_rect, dy):
+            player_vel_y = 0
+            on_ground = dy > 0  # falling down vs jumping up
 
         # Bottom boundary check (if player falls off map)
         bottom_boundary = map_height * tile_height
@@ -322,18 +247,7 @@ def main():
         screen.fill((0, 0, 0))
 
         # Draw Tiled layers
-        for layer in tmx_data.visible_layers:
-            if isinstance(layer, TiledImageLayer):
-                if layer.image:
-                    screen.blit(layer.image, (layer.x - camera_x, layer.y - camera_y))
-            elif hasattr(layer, 'data'):
-                for x, y, gid in layer:
-                    if gid != 0:
-                        tile_image = tmx_data.get_tile_image_by_gid(gid)
-                        if tile_image:
-                            tile_px = x * tile_width
-                            tile_py = y * tile_height
-                            screen.blit(tile_image, (tile_px - camera_x, tile_py - camera_y))
+        draw_layers(screen, tmx_data, camera_x, camera_y)
 
         # 1) Draw the rope line if active
         if rope_active and rope_anchor:
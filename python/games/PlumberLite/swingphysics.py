@@ -1,7 +1,9 @@
 import pygame
 import sys
 import math
-from pytmx import load_pygame, TiledImageLayer
+from collision import CollisionWorld
+from maploader import TILE_CLIMBABLE, load_map
+from tilerender import draw_layers
 
 # ---------------------------
 # HELPER FUNCTIONS
@@ -24,27 +26,6 @@ def clamp_point(origin, target, max_dist):
     return (tx, ty)
 
 
-def raycast_to_collidable(start_pos, end_pos, collidable_rects, steps=100):
-    """
-    Naive line-cast from start_pos -> end_pos.
-    Returns the first collision point or None if no hit.
-    Subdivides the line into 'steps' and checks collisions at each step.
-    """
-    x1, y1 = start_pos
-    x2, y2 = end_pos
-    for i in range(steps + 1):
-        t = i / steps
-        x = x1 + t * (x2 - x1)
-        y = y1 + t * (y2 - y1)
-        # A tiny rect to represent the point
-        point_rect = pygame.Rect(x, y, 1, 1)
-        for crect in collidable_rects:
-            if point_rect.colliderect(crect):
-                return (x, y)
-    # No hit
-    return None
-
-
 def apply_rope_physics(px, py, vx, vy, anchor_x, anchor_y, rope_length):
     """
     Physics-based rope constraint:
@@ -84,49 +65,15 @@ def main():
     clock = pygame.time.Clock()
 
     # 1) Load your Tiled map
-    tmx_data = load_pygame(r"python\games\PlumberLite\Assets\TestSet.tmx")
+    tmx_data = load_map(r"python\games\PlumberLite\Assets\TestSet.tmx")
 
     tile_width = tmx_data.tilewidth
     tile_height = tmx_data.tileheight
     map_width = tmx_data.width    # number of tiles horizontally
     map_height = tmx_data.height  # number of tiles vertically
 
-    # 2) Build lists for "collidable" rects (solid ground) and "climbable" rects (ladders)
-    collidable_rects = []
-    climbable_rects = []
-
-    for layer in tmx_data.visible_layers:
-        if hasattr(layer, 'data'):  # Tile layer
-            for x, y, gid in layer:
-                if gid == 0:
-                    continue
-                tile_props = tmx_data.get_tile_properties_by_gid(gid)
-                if tile_props:
-                    if tile_props.get("collision") is True:
-                        rect = pygame.Rect(
-                            x * tile_width,
-                            y * tile_height,
-                            tile_width,
-                            tile_height
-                        )
-                        collidable_rects.append(rect)
-                    if tile_props.get("climbable") is True:
-                        rect = pygame.Rect(
-                            x * tile_width,
-                            y * tile_height,
-                            tile_width,
-                            tile_height
-                        )
-                        climbable_rects.append(rect)
-        elif hasattr(layer, 'objects'):  # Object layer
-            for obj in layer.objects:
-                props = obj.properties
-                if props.get("collision") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    collidable_rects.append(r)
-                if props.get("climbable") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    climbable_rects.append(r)
+    # 2) Collision grid: solid ground and climbable (ladder) flags per tile
+    world = CollisionWorld.from_map(tmx_data)
 
     # 3) Basic camera setup
     camera_x = 0
@@ -184,8 +131,9 @@ def main():
 
                     # clamp target to MAX_ROPE_DIST
                     clamped_target = clamp_point(player_center, (world_mx, world_my), MAX_ROPE_DIST)
-                    hit_point = raycast_to_collidable(player_center, clamped_target, collidable_rects)
-                    if hit_point:
+                    hit = world.raycast(player_center, clamped_target)
+                    if hit:
+                        hit_point = hit[0]  # hit[1] is the surface normal
                         rope_active = True
                         rope_anchor = hit_point
                         dx = player_center[0] - hit_point[0]
@@ -249,46 +197,26 @@ def main():
 
         # Move horizontally
         player_x += player_vel_x
-        player_rect.x = int(player_x)
         # Horizontal collision
-        for crect in collidable_rects:
-            if player_rect.colliderect(crect):
-                if player_vel_x > 0:  # moving right
-                    player_rect.right = crect.left
-                    player_x = player_rect.x
-                    player_vel_x = 0
-                elif player_vel_x < 0:  # moving left
-                    player_rect.left = crect.right
-                    player_x = player_rect.x
-                    player_vel_x = 0
+        if world.move_x(player_rect, int(player_x) - player_rect.x):
+            player_x = player_rect.x
+            player_vel_x = 0
 
         # Move vertically
         player_y += player_vel_y
-        player_rect.y = int(player_y)
         # Vertical collision
         on_ground = False
-        for crect in collidable_rects:
-            if player_rect.colliderect(crect):
-                if player_vel_y > 0:  # falling
-                    player_rect.bottom = crect.top
-                    player_y = player_rect.y
-                    player_vel_y = 0
-                    on_ground = True
-                elif player_vel_y < 0:  # jumping
-                    player_rect.top = crect.bottom
-                    player_y = player_rect.y
-                    player_vel_y = 0
+        if world.move_y(player_rect, int(player_y) - player_rect.y):
+            player_y = player_rect.y
+            on_ground = player_vel_y > 0  # falling vs jumping
+            player_vel_y = 0
 
         # Update final player_x, player_y from rect
         player_x = float(player_rect.x)
         player_y = float(player_rect.y)
 
         # Check ladder
-        on_ladder = False
-        for lad in climbable_rects:
-            if player_rect.colliderect(lad):
-                on_ladder = True
-                break
+        on_ladder = world.overlaps(player_rect, TILE_CLIMBABLE)
 
         # If fell off map
         bottom_boundary = map_height * tile_height
@@ -347,18 +275,7 @@ def main():
         screen.fill((0,0,0))
 
         # Tiled layers
-        for layer in tmx_data.visible_layers:
-            if isinstance(layer, TiledImageLayer):
-                if layer.image:
-                    screen.blit(layer.image, (layer.x - camera_x, layer.y - camera_y))
-            elif hasattr(layer, 'data'):
-                for x, y, gid in layer:
-                    if gid != 0:
-                        tile_image = tmx_data.get_tile_image_by_gid(gid)
-                        if tile_image:
-                            tile_px = x * tile_width
-                            tile_py = y * tile_height
-                            screen.blit(tile_image, (tile_px - camera_x, tile_py - camera_y))
+        draw_layers(screen, tmx_data, camera_x, camera_y)
 
         # Rope line if active
         if rope_active and rope_anchor:
@@ -1,7 +1,9 @@
 import pygame
 import sys
 import math
-from pytmx import load_pygame, TiledImageLayer
+from collision import CollisionWorld
+from maploader import TILE_CLIMBABLE, load_map
+from tilerender import draw_layers
 
 def clamp_point(origin, target, max_dist):
     ox, oy = origin
@@ -15,19 +17,6 @@ def clamp_point(origin, target, max_dist):
         ty = oy + dy * ratio
     return (tx, ty)
 
-def raycast_to_collidable(start_pos, end_pos, collidable_rects, steps=100):
-    x1, y1 = start_pos
-    x2, y2 = end_pos
-    for i in range(steps + 1):
-        t = i / steps
-        x = x1 + t * (x2 - x1)
-        y = y1 + t * (y2 - y1)
-        point_rect = pygame.Rect(x, y, 1, 1)
-        for crect in collidable_rects:
-            if point_rect.colliderect(crect):
-                return (x, y)
-    return None
-
 def apply_rope_physics(px, py, vx, vy, anchor_x, anchor_y, rope_length):
     """
     Physics-based rope constraint:
@@ -54,7 +43,7 @@ def apply_rope_physics(px, py, vx, vy, anchor_x, anchor_y, rope_length):
 
     return px, py, vx, vy
 
-def collide_and_adjust(player_rect, vel_x, vel_y, collidable_rects):
+def collide_and_adjust(player_rect, vel_x, vel_y, world):
     """
     Collide horizontally, then vertically, returning updated
     (player_rect, vel_x, vel_y, on_ground).
@@ -62,27 +51,13 @@ def collide_and_adjust(player_rect, vel_x, vel_y, collidable_rects):
     on_ground = False
 
     # HORIZONTAL
-    player_rect.x += int(vel_x)
-    for crect in collidable_rects:
-        if player_rect.colliderect(crect):
-            if vel_x > 0:  # moving right
-                player_rect.right = crect.left
-                vel_x = 0
-            elif vel_x < 0:  # moving left
-                player_rect.left = crect.right
-                vel_x = 0
+    if world.move_x(player_rect, int(vel_x)):
+        vel_x = 0
 
     # VERTICAL
-    player_rect.y += int(vel_y)
-    for crect in collidable_rects:
-        if player_rect.colliderect(crect):
-            if vel_y > 0:  # falling
-                player_rect.bottom = crect.top
-                vel_y = 0
-                on_ground = True
-            elif vel_y < 0:  # jumping up
-                player_rect.top = crect.bottom
-                vel_y = 0
+    if world.move_y(player_rect, int(vel_y)):
+        on_ground = vel_y > 0  # falling vs jumping up
+        vel_y = 0
 
     return player_rect, vel_x, vel_y, on_ground
 
@@ -96,42 +71,13 @@ def main():
     clock = pygame.time.Clock()
 
     # Load map
-    tmx_data = load_pygame(r"python\games\PlumberLite\Assets\TestSet.tmx")
+    tmx_data = load_map(r"python\games\PlumberLite\Assets\TestSet.tmx")
     tile_width = tmx_data.tilewidth
     tile_height = tmx_data.tileheight
     map_width = tmx_data.width
     map_height = tmx_data.height
 
-    collidable_rects = []
-    climbable_rects = []
-    for layer in tmx_data.visible_layers:
-        if hasattr(layer, 'data'):
-            for x, y, gid in layer:
-                if gid == 0:
-                    continue
-                tile_props = tmx_data.get_tile_properties_by_gid(gid)
-                if tile_props:
-                    if tile_props.get("collision") is True:
-                        rect = pygame.Rect(
-                            x * tile_width, y * tile_height,
-                            tile_width, tile_height
-                        )
-                        collidable_rects.append(rect)
-                    if tile_props.get("climbable") is True:
-                        rect = pygame.Rect(
-                            x * tile_width, y * tile_height,
-                            tile_width, tile_height
-                        )
-                        climbable_rects.append(rect)
-        elif hasattr(layer, 'objects'):
-            for obj in layer.objects:
-                props = obj.properties
-                if props.get("collision") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    collidable_rects.append(r)
-                if props.get("climbable") is True:
-                    r = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    climbable_rects.append(r)
+    world = CollisionWorld.from_map(tmx_data)
 
     camera_x = 0
     camera_y = 0
@@ -195,8 +141,9 @@ def main():
                         (world_mx, world_my),
                         MAX_ROPE_DIST
                     )
-                    hit_pt = raycast_to_collidable((px_center, py_center), clamped, collidable_rects)
-                    if hit_pt:
+                    hit = world.raycast((px_center, py_center), clamped)
+                    if hit:
+                        hit_pt = hit[0]  # hit[1] is the surface normal
                         rope_active = True
                         rope_anchor = hit_pt
                         dx = px_center - hit_pt[0]
@@ -256,7 +203,7 @@ def main():
 
         # 1) Collision pass (for normal movement)
         player_rect, vel_x, vel_y, on_ground = collide_and_adjust(
-            player_rect, vel_x, vel_y, collidable_rects
+            player_rect, vel_x, vel_y, world
         )
 
         # 2) Rope physics
@@ -284,15 +231,11 @@ def main():
 
             # second collision pass
             player_rect, vel_x, vel_y, on_ground = collide_and_adjust(
-                player_rect, vel_x, vel_y, collidable_rects
+                player_rect, vel_x, vel_y, world
             )
 
         # Check ladder
-        on_ladder = False
-        for lad in climbable_rects:
-            if player_rect.colliderect(lad):
-                on_ladder = True
-                break
+        on_ladder = world.overlaps(player_rect, TILE_CLIMBABLE)
 
         # Fell off
         bottom_boundary = map_height*tile_height
@@ -316,18 +259,7 @@ def main():
         # Render
         screen.fill((0, 0, 0))
 
-        for layer in tmx_data.visible_layers:
-            if isinstance(layer, TiledImageLayer):
-                if layer.image:
-                    screen.blit(layer.image, (layer.x - camera_x, layer.y - camera_y))
-            elif hasattr(layer, 'data'):
-                for x, y, gid in layer:
-                    if gid != 0:
-                        tile_image = tmx_data.get_tile_image_by_gid(gid)
-                        if tile_image:
-                            tile_px = x*tile_width
-                            tile_py = y*tile_height
-                            screen.blit(tile_image, (tile_px - camera_x, tile_py - camera_y))
+        draw_layers(screen, tmx_data, camera_x, camera_y)
 
         # rope line
         if rope_active and rope_anchor:
@@ -1,6 +1,11 @@
 import pygame
 import sys
-from pytmx import load_pygame
+import time
+from lighting import MAX_DARKNESS, LightMap, darkness_alpha
+from debugstats import DebugStats
+from collision import CollisionWorld
+from maploader import load_map
+from tilerender import ChunkCache, split_tile_layers
 
 def main():
     pygame.init()
@@ -12,7 +17,7 @@ def main():
     clock = pygame.time.Clock()
 
     # Load the Tiled map
-    tmx_data = load_pygame(r"python\games\PlumberLite\Assets\FallGame.tmx")
+    tmx_data = load_map(r"python\games\PlumberLite\Assets\FallGame.tmx")
 
     tile_width = tmx_data.tilewidth
     tile_height = tmx_data.tileheight
@@ -25,6 +30,10 @@ def main():
 
     # Fonts
     font = pygame.font.Font(None, 36)
+    debug_font = pygame.font.Font(None, 24)
+
+    # Debug stats (F3 toggles the overlay and a once-a-second log line)
+    debug_stats = DebugStats(log_every=120)
 
     # Player
     player_size = 32
@@ -33,31 +42,27 @@ def main():
     player_speed = 5
 
     # Load Light Sources
-    light_sources = []
-    for obj in tmx_data.objects:
-        if "light_source" in obj.properties:
-            light_radius = int(obj.properties["light_source"])
-            light_sources.append((obj.x, obj.y, light_radius))
+    light_sources = tmx_data.light_sources
 
     print("Loaded Light Sources:", light_sources)
 
-    # Collision
-    collision_map = {}
-    for layer in tmx_data.visible_layers:
-        if not hasattr(layer, 'data'):
-            continue
-        for x, y, gid in layer:
-            if gid == 0:
-                continue
-            tile_props = tmx_data.get_tile_properties_by_gid(gid)
-            if tile_props and tile_props.get("collision") is True:
-                collision_map[(x, y)] = pygame.Rect(
-                    x * tile_width, y * tile_height, tile_width, tile_height
-                )
+    # Collision flags, one byte per tile
+    world = CollisionWorld.from_map(tmx_data)
+
+    # Darkness overlay, only rebuilt when darkness, camera or visible lights change
+    # Blur quality: "off", "low", "medium" or "high" (B cycles through them)
+    blur_qualities = ["off", "low", "medium", "high"]
+    light_map = LightMap(screen_width, screen_height, blur_quality="medium")
+
+    # Pre-rendered chunks for the static layers, split around the player
+    below_layers, above_layers = split_tile_layers(tmx_data, "Player_Layer")
+    below_cache = ChunkCache(tmx_data, below_layers)
+    above_cache = ChunkCache(tmx_data, above_layers)
 
     running = True
     while running:
         clock.tick(120)
+        frame_start = time.perf_counter()
         # Advance time
         game_time += minutes_per_tick
         if game_time >= 24 * 60:
@@ -66,6 +71,11 @@ def main():
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_b:
+                next_quality = (blur_qualities.index(light_map.blur.quality) + 1) % len(blur_qualities)
+                light_map.blur.set_quality(blur_qualities[next_quality])
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                debug_stats.toggle()
 
         # Movement
         keys = pygame.key.get_pressed()
@@ -81,11 +91,11 @@ def main():
 
         # Collisions X
         new_rect = player_rect.move(dx, 0)
-        if not any(new_rect.colliderect(r) for r in collision_map.values()):
+        if not world.overlaps(new_rect):
             player_rect.x += dx
         # Collisions Y
         new_rect = player_rect.move(0, dy)
-        if not any(new_rect.colliderect(r) for r in collision_map.values()):
+        if not world.overlaps(new_rect):
             player_rect.y += dy
 
         # Camera
@@ -97,25 +107,8 @@ def main():
         # Clear
         screen.fill((0,0,0))
 
-        # Visible tile range
-        start_x = max(0, camera_x // tile_width)
-        end_x   = min(map_width, (camera_x + screen_width)//tile_width + 1)
-        start_y = max(0, camera_y // tile_height)
-        end_y   = min(map_height, (camera_y + screen_height)//tile_height + 1)
-
         # Layers before player
-        for layer in tmx_data.visible_layers:
-            if not hasattr(layer, 'data'):
-                continue
-            if layer.name == "Player_Layer":
-                break
-            for x in range(start_x, end_x):
-                for y in range(start_y, end_y):
-                    gid = layer.data[y][x]
-                    if gid != 0:
-                        tile_image = tmx_data.get_tile_image_by_gid(gid)
-                        if tile_image:
-                            screen.blit(tile_image, (x*tile_width - camera_x, y*tile_height - camera_y))
+        tiles_drawn = below_cache.draw(screen, camera_x, camera_y)
 
         # Player
         screen_x = player_rect.x - camera_x
@@ -123,99 +116,34 @@ def main():
         pygame.draw.rect(screen, (255,0,0), (screen_x, screen_y, player_size, player_size))
 
         # Layers after player
-        draw_player = False
-        for layer in tmx_data.visible_layers:
-            if layer.name == "Player_Layer":
-                draw_player = True
-                continue
-            if not hasattr(layer, 'data'):
-                continue
-            if not draw_player:
-                continue
-            for x in range(start_x, end_x):
-                for y in range(start_y, end_y):
-                    gid = layer.data[y][x]
-                    if gid != 0:
-                        tile_image = tmx_data.get_tile_image_by_gid(gid)
-                        if tile_image:
-                            screen.blit(tile_image, (x*tile_width - camera_x, y*tile_height - camera_y))
+        tiles_drawn += above_cache.draw(screen, camera_x, camera_y)
 
         # Light Map
-        light_map = create_light_map(screen_width, screen_height, light_sources, camera_x, camera_y, game_time)
-        light_map = blur_surface(light_map, amount=2)
-        screen.blit(light_map, (0, 0))
+        dark_alpha = darkness_alpha(game_time)
+        light_surf = light_map.update(light_sources, camera_x, camera_y, dark_alpha)
+        if light_surf is not None:
+            screen.blit(light_surf, (0, 0))
 
         # Clock
         draw_clock(screen, font, game_time)
 
+        # Debug stats
+        if debug_stats.enabled:
+            debug_stats.record(
+                hour=(game_time/60.0) % 24.0,
+                factor=dark_alpha / MAX_DARKNESS,
+                alpha=dark_alpha,
+                lights=light_map.visible_lights,
+                tiles=tiles_drawn,
+                frame_ms=(time.perf_counter() - frame_start) * 1000.0,
+            )
+            debug_stats.draw(screen, debug_font)
+
         pygame.display.flip()
 
     pygame.quit()
     sys.exit()
 
-def extendedDayNightFactor(game_time):
-    """
-    0 => full day, 1 => full night
-    - Day: 8->17 => factor=0
-    - Dusk: 17->20 => 0..1
-    - Night: 20->5 => 1
-    - Dawn: 5->8 => 1..0
-    """
-    hour = (game_time / 60.0) % 24.0
-
-    # Dusk: 17->20 => 0..1
-    if 17.0 <= hour < 20.0:
-        prog = (hour - 17.0)/3.0  # 0..1 over 3 hours
-        return prog
-    # Night: 20->5 => factor=1
-    elif hour >= 20.0 or hour < 5.0:
-        return 1.0
-    # Dawn: 5->8 => 1..0
-    elif 5.0 <= hour < 8.0:
-        dawn_prog = (hour - 5.0)/3.0  # 0..1
-        return 1.0 - dawn_prog
-    # Day: 8->17 => factor=0
-    else:
-        return 0.0
-
-def create_light_map(width, height, light_sources, cx, cy, game_time):
-    surf = pygame.Surface((width, height), pygame.SRCALPHA)
-
-    df = extendedDayNightFactor(game_time)
-    max_alpha = 200
-    dark_alpha = int(max_alpha * df)
-    surf.fill((0,0,0,dark_alpha))
-
-    for (lx,ly,radius) in light_sources:
-        sx = lx - cx
-        sy = ly - cy
-        draw_light_on_map(surf, sx, sy, radius)
-
-    # Debug in console to see what's happening
-    hour_f = (game_time/60.0)%24.0
-    print(f"H={hour_f:.2f} Factor={df:.2f} alpha={dark_alpha}")
-
-    return surf
-
-def draw_light_on_map(surface, x, y, radius):
-    """Center fully removes darkness => never extinguish."""
-    light_surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-
-    # from center=0 out to radius
-    for r in range(0, radius, 2):
-        alpha = int(255 * (1.0 - (r/float(radius))))
-        pygame.draw.circle(light_surf, (0,0,0,alpha), (radius, radius), r)
-
-    surface.blit(light_surf, (x - radius, y - radius), special_flags=pygame.BLEND_RGBA_SUB)
-
-def blur_surface(surface, amount=2):
-    for _ in range(amount):
-        surface.blit(surface, (1,0), special_flags=pygame.BLEND_RGBA_ADD)
-        surface.blit(surface, (-1,0), special_flags=pygame.BLEND_RGBA_ADD)
-        surface.blit(surface, (0,1), special_flags=pygame.BLEND_RGBA_ADD)
-        surface.blit(surface, (0,-1), special_flags=pygame.BLEND_RGBA_ADD)
-    return surface
-
 def draw_clock(screen, font, game_time):
     hour_float = (game_time/60.0) % 24.0
     hour_i = int(hour_float)
@@ -0,0 +1,194 @@
+import pygame
+from collections import OrderedDict
+
+# ---------------------------
+# LAYER HELPERS
+# ---------------------------
+
+def visible_cells(camera_x, camera_y, view_w, view_h, cell_w, cell_h, cells_x=None, cells_y=None):
+    """
+    Returns (start_x, end_x, start_y, end_y), the range of grid cells that a
+    view_w x view_h camera at (camera_x, camera_y) can see. End is exclusive.
+    When the grid size is given the range is clamped to it.
+    """
+    start_x = int(camera_x // cell_w)
+    end_x = int((camera_x + view_w - 1) // cell_w) + 1
+    start_y = int(camera_y // cell_h)
+    end_y = int((camera_y + view_h - 1) // cell_h) + 1
+    if cells_x is not None:
+        start_x = max(0, start_x)
+        end_x = min(cells_x, end_x)
+    if cells_y is not None:
+        start_y = max(0, start_y)
+        end_y = min(cells_y, end_y)
+    return start_x, end_x, start_y, end_y
+
+def split_tile_layers(tmx_data, split_name="Player_Layer"):
+    """
+    Splits the visible tile layers around the layer named 'split_name'.
+    Returns (layers_before, layers_after) so the player can be drawn in between.
+    """
+    before = []
+    after = []
+    target = before
+    for layer in tmx_data.visible_layers:
+        if layer.name == split_name:
+            target = after
+            continue
+        if not hasattr(layer, 'data'):
+            continue
+        target.append(layer)
+    return before, after
+
+
+# ---------------------------
+# CULLED LAYER DRAWING
+# ---------------------------
+
+def draw_tile_layer(surface, tmx_data, layer, camera_x, camera_y, offset_x=0, wrap=False):
+    """
+    Blits the tiles of 'layer' that fall inside the camera view onto 'surface'.
+    'offset_x' (pixels) scrolls the layer left; with 'wrap' it repeats
+    horizontally, which is how the Clouds layer drifts.
+    Returns the number of tiles drawn.
+    """
+    tile_width = tmx_data.tilewidth
+    tile_height = tmx_data.tileheight
+    view_w, view_h = surface.get_size()
+    scroll_x = camera_x + offset_x
+
+    if wrap:
+        start_x, end_x, start_y, end_y = visible_cells(
+            scroll_x, camera_y, view_w, view_h, tile_width, tile_height, None, tmx_data.height)
+    else:
+        start_x, end_x, start_y, end_y = visible_cells(
+            scroll_x, camera_y, view_w, view_h, tile_width, tile_height, tmx_data.width, tmx_data.height)
+
+    images = tmx_data.get_tile_image_by_gid
+    tiles_drawn = 0
+    for y in range(start_y, end_y):
+        row = layer.data[y]
+        screen_y = y * tile_height - camera_y
+        for x in range(start_x, end_x):
+            gid = row[x % tmx_data.width] if wrap else row[x]
+            if gid == 0:
+                continue
+            tile_image = images(gid)
+            if tile_image:
+                surface.blit(tile_image, (x * tile_width - scroll_x, screen_y))
+                tiles_drawn += 1
+    return tiles_drawn
+
+
+def draw_layers(surface, tmx_data, camera_x, camera_y, skip=()):
+    """
+    Draws every visible image and tile layer (except those in 'skip') in map
+    order, culled to the camera view. Returns the number of tiles drawn.
+    """
+    tiles_drawn = 0
+    for layer in tmx_data.visible_layers:
+        if layer in skip:
+            continue
+        if hasattr(layer, 'image'):
+            if layer.image:
+                surface.blit(layer.image, (layer.x - camera_x, layer.y - camera_y))
+        elif hasattr(layer, 'data'):
+            tiles_drawn += draw_tile_layer(surface, tmx_data, layer, camera_x, camera_y)
+    return tiles_drawn
+
+
+# ---------------------------
+# CHUNK CACHE
+# ---------------------------
+
+class ChunkCache:
+    """
+    Bakes a group of static tile layers into chunk_size x chunk_size tile surfaces.
+    Chunks are baked lazily the first time they come on screen and the least
+    recently used ones are dropped once more than 'max_chunks' are cached.
+    """
+
+    def __init__(self, tmx_data, layers, chunk_size=16, max_chunks=64):
+        self.tmx_data = tmx_data
+        self.layers = layers
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+
+        self.tile_width = tmx_data.tilewidth
+        self.tile_height = tmx_data.tileheight
+        self.chunk_px_w = chunk_size * self.tile_width
+        self.chunk_px_h = chunk_size * self.tile_height
+        self.chunks_x = -(-tmx_data.width // chunk_size)
+        self.chunks_y = -(-tmx_data.height // chunk_size)
+
+        # (cx, cy) -> (surface or None if the chunk is empty, tile count)
+        self._chunks = OrderedDict()
+
+    def _bake(self, cx, cy):
+        """Blits every tile of the chunk at (cx, cy) into a single surface."""
+        start_x = cx * self.chunk_size
+        start_y = cy * self.chunk_size
+        end_x = min(self.tmx_data.width, start_x + self.chunk_size)
+        end_y = min(self.tmx_data.height, start_y + self.chunk_size)
+
+        surf = None
+        tile_count = 0
+        for layer in self.layers:
+            for y in range(start_y, end_y):
+                row = layer.data[y]
+                for x in range(start_x, end_x):
+                    gid = row[x]
+                    if gid == 0:
+                        continue
+                    tile_image = self.tmx_data.get_tile_image_by_gid(gid)
+                    if not tile_image:
+                        continue
+                    if surf is None:
+                        surf = pygame.Surface((self.chunk_px_w, self.chunk_px_h), pygame.SRCALPHA)
+                    surf.blit(tile_image, ((x - start_x) * self.tile_width, (y - start_y) * self.tile_height))
+                    tile_count += 1
+
+        if surf is not None and pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        return surf, tile_count
+
+    def get_chunk(self, cx, cy):
+        """Returns the cached (surface, tile_count) for a chunk, baking it if needed."""
+        key = (cx, cy)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        chunk = self._bake(cx, cy)
+        self._chunks[key] = chunk
+        while len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        return chunk
+
+    def draw(self, surface, camera_x, camera_y):
+        """
+        Blits the chunks overlapping the camera view onto 'surface'.
+        Returns the number of tiles those chunks contain.
+        """
+        if not self.layers:
+            return 0
+
+        view_w, view_h = surface.get_size()
+        start_cx, end_cx, start_cy, end_cy = visible_cells(
+            camera_x, camera_y, view_w, view_h,
+            self.chunk_px_w, self.chunk_px_h, self.chunks_x, self.chunks_y)
+
+        tiles_drawn = 0
+        for cy in range(start_cy, end_cy):
+            for cx in range(start_cx, end_cx):
+                chunk_surf, tile_count = self.get_chunk(cx, cy)
+                if chunk_surf is None:
+                    continue
+                surface.blit(chunk_surf, (cx * self.chunk_px_w - camera_x, cy * self.chunk_px_h - camera_y))
+                tiles_drawn += tile_count
+        return tiles_drawn
+
+    def clear(self):
+        """Drops every baked chunk (e.g. after the layers were edited)."""
+        self._chunks.clear()
@@ -0,0 +1,63 @@
+# Images for the game: every file is decoded once on a thread pool as soon
+# as the AssetManager is made, and the screens only wait for the ones they
+# draw. Scaled copies are made from the decoded originals in memory, so a
+# new game or a resolution change never goes back to the disk.
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+LOADER_THREADS = 4
+SCALED_CACHE_SIZE = 64  # scaled surfaces kept, least recently used dropped first
+
+
+class AssetManager:
+    """
+    'images' maps a name to (path, alpha). Decoding (pygame.image.load) runs
+    on worker threads; converting to the display format has to happen after
+    the display exists and on the main thread, so get() does that the first
+    time a name is asked for, with convert_alpha() if 'alpha' is set and
+    convert() otherwise. get() blocks until that image is decoded; ready()
+    and progress() tell a loading screen whether it would.
+    A file that fails to load raises its pygame.error from get().
+    """
+
+    def __init__(self, images, workers=LOADER_THREADS):
+        self.images = images
+        self.originals = {}  # name -> converted surface
+        self.scaled_cache = OrderedDict()  # (name, size) -> scaled surface
+        pool = ThreadPoolExecutor(workers, thread_name_prefix="asset-loader")
+        self.pending = {name: pool.submit(pygame.image.load, path) for name, (path, _) in images.items()}
+        pool.shutdown(wait=False)  # the queued loads still run; the threads exit after them
+
+    def ready(self, names=None):
+        """True if every image in 'names' (default all) is decoded."""
+        names = self.images if names is None else names
+        return all(name in self.originals or self.pending[name].done() for name in names)
+
+    def progress(self):
+        """(images decoded, total images)."""
+        done = sum(name in self.originals or future.done() for name, future in self.pending.items())
+        return done, len(self.pending)
+
+    def get(self, name):
+        """The image 'name' as loaded, in the display format."""
+        image = self.originals.get(name)
+        if image is None:
+            image = self.pending[name].result()
+            image = image.convert_alpha() if self.images[name][1] else image.convert()
+            self.originals[name] = image
+        return image
+
+    def scaled(self, name, size):
+        """The image 'name' scaled to 'size', scaling only the first time."""
+        key = (name, tuple(size))
+        image = self.scaled_cache.get(key)
+        if image is not None:
+            self.scaled_cache.move_to_end(key)
+            return image
+        image = pygame.transform.scale(self.get(name), key[1])
+        self.scaled_cache[key] = image
+        if len(self.scaled_cache) > SCALED_CACHE_SIZE:
+            self.scaled_cache.popitem(last=False)
+        return image
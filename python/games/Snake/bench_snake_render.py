@@ -0,0 +1,108 @@
+import time
+import pygame
+from snake_body import DIR_VECTORS, LEFT, RIGHT, SnakeBody
+
+# ---------------------------
+# Compares the old our_snake() (reversed list copies and a rotate per segment)
+# with the direction-coded SnakeBody renderer on long snakes.
+# Run from this folder: python bench_snake_render.py
+# ---------------------------
+
+BLOCK = 10
+GRID_WIDTH = 200  # cells per row of the serpentine test snake
+LENGTHS = [1000, 10000]
+FRAMES = 20
+
+
+def make_sprites():
+    head = pygame.Surface((BLOCK, BLOCK), pygame.SRCALPHA)
+    head.fill((200, 50, 50))
+    body = pygame.Surface((BLOCK, BLOCK), pygame.SRCALPHA)
+    body.fill((50, 200, 50))
+    tail = pygame.Surface((BLOCK, BLOCK), pygame.SRCALPHA)
+    tail.fill((50, 50, 200))
+    atlas = {}
+    for name, image in (("head", head), ("body", body), ("tail", tail)):
+        for angle in (0, 90, 180, 270):
+            atlas[name, angle] = pygame.transform.rotate(image, angle)
+    return head, body, tail, atlas
+
+
+def make_snake(length):
+    """A snake that zig-zags across rows, so it has straights and curves."""
+    body = SnakeBody(0, 0, BLOCK)
+    x, y = 0, 0
+    direction = RIGHT
+    while len(body) < length:
+        if direction == RIGHT and x == (GRID_WIDTH - 1) * BLOCK or direction == LEFT and x == 0:
+            body.push_head(x, y + BLOCK)
+            y += BLOCK
+            direction = LEFT if direction == RIGHT else RIGHT
+            continue
+        x += DIR_VECTORS[direction][0] * BLOCK
+        body.push_head(x, y)
+    return body
+
+
+def old_our_snake(screen, snake_list, head_image, body_image, tail_image):
+    # our_snake() as it was before SnakeBody and the sprite atlas (head/tail
+    # rotation picks trimmed, the per-segment work is the same)
+    for i, segment in enumerate(snake_list[::-1]):
+        if i == 0:
+            dx = segment[0] - snake_list[-2][0]
+            rotated_head = pygame.transform.rotate(head_image, 180 if dx > 0 else 0)
+            screen.blit(rotated_head, (segment[0], segment[1]))
+        elif i == len(snake_list) - 1:
+            dx = snake_list[1][0] - segment[0]
+            rotated_tail = pygame.transform.rotate(tail_image, 0 if dx > 0 else 180)
+            screen.blit(rotated_tail, (segment[0], segment[1]))
+        else:
+            prev_seg = snake_list[::-1][i - 1]
+            next_seg = snake_list[::-1][i + 1]
+            dx_prev, dy_prev = segment[0] - prev_seg[0], segment[1] - prev_seg[1]
+            dx_next, dy_next = next_seg[0] - segment[0], next_seg[1] - segment[1]
+            if (dx_prev == 0 and dx_next == 0) or (dy_prev == 0 and dy_next == 0):
+                angle = 0 if dx_prev != 0 or dx_next != 0 else 90
+            else:
+                angle = 90
+            screen.blit(pygame.transform.rotate(body_image, angle), (segment[0], segment[1]))
+
+
+def new_our_snake(screen, snake_body, atlas):
+    screen.blits([(atlas[sprite], position) for position, sprite in snake_body.sprites()], False)
+
+
+def time_frames(draw, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+def main():
+    head, body, tail, atlas = make_sprites()
+    print(f"{'segments':>9} {'old ms/frame':>13} {'new ms/frame':>13} {'step ms':>8}")
+    for length in LENGTHS:
+        snake = make_snake(length)
+        snake_list = [list(segment) for segment in snake.positions()]
+        rows = length // GRID_WIDTH + 2
+        screen = pygame.Surface((GRID_WIDTH * BLOCK, rows * BLOCK))
+
+        # The old renderer is quadratic, so give it fewer frames on long snakes
+        old_frames = max(1, FRAMES * 1000 // length)
+        old_ms = time_frames(lambda: old_our_snake(screen, snake_list, head, body, tail), old_frames)
+        new_ms = time_frames(lambda: new_our_snake(screen, snake, atlas), FRAMES)
+
+        # Moving the head and dropping the tail only touches the two ends
+        x, y = snake.head
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            y += BLOCK
+            snake.push_head(x, y)
+            snake.drop_tail()
+        step_ms = (time.perf_counter() - start) * 1000.0 / FRAMES
+        print(f"{length:>9} {old_ms:>13.2f} {new_ms:>13.2f} {step_ms:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
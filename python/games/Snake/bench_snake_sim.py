@@ -0,0 +1,87 @@
+import random
+import time
+import numpy as np
+from snake_batch import BatchSnakeSim
+from snake_body import DOWN, LEFT, RIGHT, UP
+from snake_sim import SnakeSim
+
+# ---------------------------
+# Steps per second of the headless simulations: SnakeSim one game at a time,
+# and BatchSnakeSim with N boards per step() call. Both play a greedy
+# "head for the food" policy with some random turns, and finished games are
+# restarted straight away.
+# Run from this folder: python bench_snake_sim.py
+# ---------------------------
+
+COLS = 60  # the default 600x400 window with 10 px blocks
+ROWS = 40
+SECONDS = 2.0  # how long each case runs
+BATCH_SIZES = [1, 64, 4096]
+RANDOM_TURNS = 0.2
+
+
+def greedy_action(sim, rng):
+    if rng.random() < RANDOM_TURNS:
+        return rng.randrange(4)
+    food_x, food_y = sim.food_position
+    head_x, head_y = sim.body.head
+    if food_x != head_x:
+        return RIGHT if food_x > head_x else LEFT
+    return DOWN if food_y > head_y else UP
+
+
+def bench_single():
+    sim = SnakeSim(COLS, ROWS, seed=1)
+    rng = random.Random(2)
+    steps = 0
+    games = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        for _ in range(1000):
+            sim.step(greedy_action(sim, rng))
+            steps += 1
+            if sim.done:
+                sim.reset()
+                games += 1
+    return steps, games, time.perf_counter() - start
+
+
+def greedy_actions(batch, rng):
+    head_col = batch.head % batch.cols
+    head_row = batch.head // batch.cols
+    food_col = batch.food % batch.cols
+    food_row = batch.food // batch.cols
+    actions = np.where(food_col > head_col, RIGHT,
+              np.where(food_col < head_col, LEFT,
+              np.where(food_row > head_row, DOWN, UP)))
+    random_turn = rng.random(batch.n) < RANDOM_TURNS
+    actions[random_turn] = rng.integers(0, 4, size=int(random_turn.sum()))
+    return actions
+
+
+def bench_batch(n):
+    batch = BatchSnakeSim(n, COLS, ROWS, seed=1)
+    rng = np.random.default_rng(2)
+    steps = 0
+    games = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        batch.step(greedy_actions(batch, rng))
+        steps += n
+        if batch.done.any():
+            games += int(batch.done.sum())
+            batch.reset(batch.done)
+    return steps, games, time.perf_counter() - start
+
+
+def main():
+    print(f"{'engine':>16} {'steps/sec':>12} {'games/sec':>10}")
+    steps, games, seconds = bench_single()
+    print(f"{'SnakeSim':>16} {steps / seconds:>12,.0f} {games / seconds:>10,.0f}")
+    for n in BATCH_SIZES:
+        steps, games, seconds = bench_batch(n)
+        print(f"{f'Batch N={n}':>16} {steps / seconds:>12,.0f} {games / seconds:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# High score table: loaded from disk once, kept sorted in memory, and saved
+# by appending one line per new entry. The file is rewritten (atomically)
+# only when the appended lines pile up or the table is cleared.
+
+import bisect
+import json
+import os
+
+HEADER = "#snake-highscores 1"
+COMPACT_AFTER = 4  # rewrite the file once it has this many times more lines than the table
+
+
+class HighScoreStore:
+    """
+    The best 'limit' scores, highest first, as (name, score). Ties keep the
+    order they were added in.
+    On disk: a header line, then one "score<TAB>name" line per entry with the
+    name as a JSON string, so any character in a name is safe. New entries
+    are appended (and fsynced); a compaction writes the table to a temp file,
+    fsyncs it and swaps it in with os.replace, so a crash leaves either the
+    old file or the new one. A file from before the header existed
+    ("name:score" lines) is read by splitting at the last ':' and rewritten
+    in the new format.
+    """
+
+    def __init__(self, path, limit=10):
+        self.path = path
+        self.limit = limit
+        self.table = []  # sorted (-score, serial, name)
+        self.serial = 0
+        self.file_lines = 0  # entry lines in the file, compacted or appended
+        self.load()
+
+    def load(self):
+        self.table = []
+        self.serial = 0
+        self.file_lines = 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as file:
+            text = file.read()
+        lines = text.splitlines()
+        legacy = not lines or lines[0] != HEADER
+        for line in lines if legacy else lines[1:]:
+            entry = parse_legacy_line(line) if legacy else parse_line(line)
+            if entry is not None:  # skips blank lines and a line cut off by a crash
+                self._insert(*entry)
+                self.file_lines += 1
+        # Old format, or a last line cut off mid-write that the next append would run into
+        if text and (legacy or not text.endswith("\n")):
+            self.compact()
+
+    def __len__(self):
+        return len(self.table)
+
+    def top(self, k=None):
+        """The best 'k' (default all kept) entries as (name, score), highest first."""
+        entries = self.table if k is None else self.table[:k]
+        return [(name, -negative_score) for negative_score, _, name in entries]
+
+    def qualifies(self, score):
+        """True if 'score' would make it onto the table."""
+        return len(self.table) < self.limit or score > -self.table[-1][0]
+
+    def add(self, name, score):
+        """
+        Adds an entry. Returns its rank (0 is the top) or None if it didn't
+        make the table, in which case nothing is written.
+        """
+        if not self.qualifies(score):
+            return None
+        rank = self._insert(name, score)
+        with open(self.path, "a", encoding="utf-8") as file:
+            if self.file_lines == 0 and file.tell() == 0:
+                file.write(HEADER + "\n")
+            file.write(format_line(name, score))
+            file.flush()
+            os.fsync(file.fileno())
+        self.file_lines += 1
+        if self.file_lines > self.limit * COMPACT_AFTER:
+            self.compact()
+        return rank
+
+    def clear(self):
+        self.table = []
+        self.compact()
+
+    def compact(self):
+        """Rewrites the file with just the table, atomically."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(HEADER + "\n")
+            for name, score in self.top():
+                file.write(format_line(name, score))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+        self.file_lines = len(self.table)
+
+    def _insert(self, name, score):
+        entry = (-score, self.serial, name)
+        self.serial += 1
+        rank = bisect.bisect(self.table, entry)
+        self.table.insert(rank, entry)
+        del self.table[self.limit:]
+        return rank
+
+
+def format_line(name, score):
+    return f"{score}\t{json.dumps(name)}\n"
+
+def parse_line(line):
+    """(name, score) from a "score<TAB>name" line, or None if it isn't one."""
+    score, tab, name = line.partition("\t")
+    if not tab:
+        return None
+    try:
+        name = json.loads(name)
+        score = int(score)
+    except ValueError:
+        return None
+    return (name, score) if isinstance(name, str) else None
+
+def parse_legacy_line(line):
+    """(name, score) from an old "name:score" line; the name may contain ':'."""
+    name, colon, score = line.strip().rpartition(":")
+    if not colon:
+        return None
+    try:
+        return name, int(score)
+    except ValueError:
+        return None
+
+def fsync_directory(path):
+    """Makes a rename in 'path' durable where the OS allows it (not on Windows)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,169 @@
+# Game settings: read from config.ini once, typed and checked, kept in
+# memory, and written back by a background thread shortly after the last
+# change, so holding a key in the settings menu doesn't hit the disk on
+# every repeat.
+
+import configparser
+import io
+import os
+import threading
+import time
+
+SECTION = "SETTINGS"
+WRITE_DELAY = 0.5  # seconds without changes before the file is written
+
+# name -> (type, default, min, max); min/max are only used for ints
+SCHEMA = {
+    "width": (int, 600, 100, 10000),
+    "height": (int, 400, 100, 10000),
+    "snake_block": (int, 10, 1, 500),
+    "snake_speed": (int, 15, 1, 50),
+    "fullscreen": (bool, False, None, None),
+    # Only redraw the cells that changed each tick (False for full redraws)
+    "dirty_rects": (bool, True, None, None),
+    # Write a replay of every finished game (see snake_replay.py)
+    "save_replays": (bool, True, None, None),
+}
+# Written to a new config.ini; the rest only appear once they are changed
+NEW_FILE_KEYS = ["width", "height", "snake_block", "snake_speed"]
+
+
+def parse_value(name, text):
+    """The typed value of setting 'name' from its config.ini text. Raises ValueError."""
+    kind = SCHEMA[name][0]
+    if kind is bool:
+        state = configparser.ConfigParser.BOOLEAN_STATES.get(text.strip().lower())
+        if state is None:
+            raise ValueError(f"{name} must be true or false, not {text!r}")
+        return state
+    try:
+        value = int(text)
+    except ValueError:
+        raise ValueError(f"{name} must be a whole number, not {text!r}") from None
+    return check_value(name, value)
+
+def check_value(name, value):
+    """Returns 'value' if it is valid for setting 'name'. Raises ValueError."""
+    kind, _, low, high = SCHEMA[name]
+    if type(value) is not kind:
+        raise ValueError(f"{name} must be {kind.__name__}, not {value!r}")
+    if kind is int and not low <= value <= high:
+        raise ValueError(f"{name} must be between {low} and {high}, not {value}")
+    return value
+
+def atomic_write(path, text):
+    """Writes 'text' to a temp file next to 'path' and renames it over 'path'."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+class SettingsService:
+    """
+    The settings in SCHEMA as typed values: settings["width"] reads one,
+    update(width=..., height=...) changes several at once. A value that
+    doesn't parse or is out of range is reported and replaced by its default.
+    Changes mark the settings dirty and wake a daemon thread, which writes
+    the file once 'delay' seconds pass with no further change. The write goes
+    through a temp file and os.replace, so config.ini is never half written.
+    flush() writes right away; close() flushes and stops the thread, and is
+    meant to run at exit.
+    Keys in config.ini that aren't in SCHEMA are kept as they are.
+    """
+
+    def __init__(self, path, delay=WRITE_DELAY):
+        self.path = path
+        self.delay = delay
+        self.values = {}
+        self.extra = {}  # unknown keys, as text
+        self.stored = set()  # keys written to the file
+        self.dirty = False
+        self.last_change = 0.0
+        self.closed = False
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.write_lock = threading.Lock()  # one write at a time, worker or flush()
+        self.load()
+        self.worker = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+        self.worker.start()
+
+    def load(self):
+        config = configparser.ConfigParser(interpolation=None)
+        exists = os.path.exists(self.path)
+        if exists:
+            config.read(self.path)
+        section = config[SECTION] if config.has_section(SECTION) else {}
+        self.values = {}
+        for name, (_, default, _, _) in SCHEMA.items():
+            self.values[name] = default
+            if name not in section:
+                continue
+            try:
+                self.values[name] = parse_value(name, section[name])
+            except ValueError as error:
+                print(f"{self.path}: {error}; using {default}")
+        self.extra = {key: value for key, value in section.items() if key not in SCHEMA}
+        self.stored = {name for name in SCHEMA if name in section}
+        if not exists:
+            self.stored = set(NEW_FILE_KEYS)
+            self.dirty = True
+            self.flush()
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def update(self, **values):
+        """Changes settings (checked first, so a bad value changes nothing) and schedules a write."""
+        for name, value in values.items():
+            if name not in SCHEMA:
+                raise KeyError(name)
+            check_value(name, value)
+        with self.lock:
+            changed = {name: value for name, value in values.items() if self.values[name] != value}
+            if not changed:
+                return
+            self.values.update(changed)
+            self.stored.update(changed)
+            self.dirty = True
+            self.last_change = time.monotonic()
+            self.changed.notify()
+
+    def flush(self):
+        """Writes the settings now if anything changed since the last write."""
+        with self.write_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                text = self._render()
+                self.dirty = False
+            atomic_write(self.path, text)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.changed.notify()
+        self.flush()
+
+    def _render(self):
+        config = configparser.ConfigParser(interpolation=None)
+        config[SECTION] = {name: str(self.values[name]) for name in SCHEMA if name in self.stored}
+        config[SECTION].update(self.extra)
+        text = io.StringIO()
+        config.write(text)
+        return text.getvalue()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                # Sleep until something changes, then until it has been quiet for 'delay'
+                while not self.closed and (not self.dirty or time.monotonic() < self.last_change + self.delay):
+                    if self.dirty:
+                        self.changed.wait(self.last_change + self.delay - time.monotonic())
+                    else:
+                        self.changed.wait()
+                if self.closed:
+                    return
+            self.flush()
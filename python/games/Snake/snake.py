@@ -1,8 +1,16 @@
 import pygame
 import time
 import random
-import configparser
 import os
+import argparse
+import atexit
+import struct
+from collections import OrderedDict, deque
+from assets import AssetManager
+from highscores import HighScoreStore
+from settings import SettingsService
+from snake_body import DIR_VECTORS, DOWN, LEFT, RIGHT, UP
+from snake_replay import Replay
 
 pygame.init()
 
@@ -15,66 +23,214 @@ green = (0, 255, 0)
 blue = (50, 153, 213)
 
 HIGHSCORES_FILE = (r"python\games\Snake\highscores.txt")
+# Loaded once here; the score screens only read the in-memory table
+high_scores = HighScoreStore(HIGHSCORES_FILE)
+REPLAY_DIR = (r"python\games\Snake\replays")
 
-# Load configuration or create a default one
+# Settings from config.ini (created with defaults if missing), typed and
+# checked in settings.py. Changes are written in the background, and
+# anything not yet written is flushed when the game exits.
 CONFIG_FILE = (r"python\games\Snake\config.ini")
-def load_config():
-    config = configparser.ConfigParser()
-    if not os.path.exists(CONFIG_FILE):
-        config['SETTINGS'] = {
-            'width': '600',
-            'height': '400',
-            'snake_block': '10',
-            'snake_speed': '15'
-        }
-        with open(CONFIG_FILE, 'w') as configfile:
-            config.write(configfile)
-    else:
-        config.read(CONFIG_FILE)
-    return config
-
-def save_config(config):
-    with open(CONFIG_FILE, 'w') as configfile:
-        config.write(configfile)
-
-config = load_config()
-width = int(config['SETTINGS']['width'])
-height = int(config['SETTINGS']['height'])
-snake_block = int(config['SETTINGS']['snake_block'])
-snake_speed = int(config['SETTINGS']['snake_speed'])
+settings = SettingsService(CONFIG_FILE)
+atexit.register(settings.close)
+width = settings["width"]
+height = settings["height"]
+snake_block = settings["snake_block"]
+snake_speed = settings["snake_speed"]
+dirty_rects = settings["dirty_rects"]
+save_replays = settings["save_replays"]  # replays of finished games go to REPLAY_DIR
 
 # Screen dimensions
 screen = pygame.display.set_mode((width, height))
 pygame.display.set_caption('Danger Noodle')
 fullscreen = False
 
-# Load and set the custom game icon
-icon = pygame.image.load(r"python\games\Snake\Assets\snake_icon.ico").convert_alpha()
-pygame.display.set_icon(icon)
-
-# Load and scale the main menu background image
-main_menu_bg = pygame.image.load(r"python\games\Snake\Assets\main_menu.png").convert()
-game_loop_bg = pygame.image.load(r"python\games\Snake\Assets\game_background.png").convert()
+# Every image, as name -> (path, has alpha). They all start decoding on the
+# asset loader's threads right away; the menu only waits for its background
+# and the sprites are scaled from memory when a game starts.
+IMAGES = {
+    "icon": (r"python\games\Snake\Assets\snake_icon.ico", True),
+    "main_menu": (r"python\games\Snake\Assets\main_menu.png", False),
+    "game_background": (r"python\games\Snake\Assets\game_background.png", False),
+    "snake_head": (r"python\games\Snake\Assets\snake_head.png", True),
+    "snake_body": (r"python\games\Snake\Assets\snake_body.png", True),
+    "snake_tail": (r"python\games\Snake\Assets\snake_tail.png", True),
+    "food": (r"python\games\Snake\Assets\food.png", True),
+    "food2": (r"python\games\Snake\Assets\food2.png", True),
+    "food3": (r"python\games\Snake\Assets\food3.png", True),
+    "food4": (r"python\games\Snake\Assets\food4.png", True),
+    "egg": (r"python\games\Snake\Assets\egg.png", True),
+    "divider": (r"python\games\Snake\Assets\divider.png", True),
+    "poison": (r"python\games\Snake\Assets\poison.png", True),
+    "antidote": (r"python\games\Snake\Assets\antidote.png", True),
+}
+assets = AssetManager(IMAGES)
 
 clock = pygame.time.Clock()
 
-font_style = pygame.font.SysFont("bahnschrift", 25)
-score_font = pygame.font.SysFont("comicsansms", 35)
+# Menus and the pre-start screen sleep until there is input; this caps how
+# often they redraw while events stream in (mouse motion, key repeat)
+MENU_FPS = 60
+
+def wait_for_events(timeout=0):
+    """
+    Blocks until an event arrives (or 'timeout' ms pass, 0 waits for ever) and
+    returns every pending event, [] on timeout. A static screen then costs no
+    CPU between redraws.
+    """
+    event = pygame.event.wait(timeout)
+    clock.tick(MENU_FPS)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+# The game loop draws at RENDER_FPS while the snake itself moves snake_speed
+# times a second. After a stall at most MAX_STEPS_PER_FRAME steps are caught
+# up, and at most KEY_BUFFER_SIZE key presses wait for the next steps.
+RENDER_FPS = 60
+MAX_STEPS_PER_FRAME = 5
+KEY_BUFFER_SIZE = 3
+KEY_DIRECTIONS = {
+    pygame.K_LEFT: LEFT, pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT,
+    pygame.K_UP: UP, pygame.K_w: UP,
+    pygame.K_DOWN: DOWN, pygame.K_s: DOWN,
+}
+
+# Backgrounds scaled to the current resolution, keyed by (image name, size)
+_background_cache = {}
+
+def scaled_background(name):
+    """Image 'name' scaled to the screen and converted to its format, cached until the mode changes."""
+    key = (name, screen.get_size())
+    scaled = _background_cache.get(key)
+    if scaled is None:
+        scaled = pygame.transform.scale(assets.get(name), key[1]).convert()
+        _background_cache[key] = scaled
+    return scaled
+
+def set_display_mode(size, flags=0):
+    """Switches the display mode and drops the backgrounds scaled for the old one."""
+    _background_cache.clear()
+    return pygame.display.set_mode(size, flags)
+
+# Fonts are looked up once per (name, size) and shared by every screen
+_fonts = {}
+
+def get_font(name, size):
+    font = _fonts.get((name, size))
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[name, size] = font
+    return font
+
+# Rendered text and its background, keyed by (text, font, text color, bg color)
+TEXT_CACHE_SIZE = 256
+_text_cache = OrderedDict()
+
+def cached_text(text, font, text_color, bg_color=None):
+    """
+    Returns (text surface, background surface or None) for 'text', rendering
+    it only the first time. The least recently used entries are dropped once
+    more than TEXT_CACHE_SIZE are cached.
+    """
+    key = (text, font, tuple(text_color), tuple(bg_color) if bg_color is not None else None)
+    entry = _text_cache.get(key)
+    if entry is not None:
+        _text_cache.move_to_end(key)
+        return entry
+
+    text_surface = font.render(text, True, text_color)
+    bg_surface = None
+    if bg_color is not None:
+        # Semi-transparent background, 5px bigger than the text on each side
+        bg_surface = pygame.Surface((text_surface.get_width() + 10, text_surface.get_height() + 10), pygame.SRCALPHA)
+        bg_surface.fill(bg_color)
+    entry = (text_surface, bg_surface)
+    _text_cache[key] = entry
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return entry
+
+# The last semi-transparent panel handed out. Its only user is the game over
+# name box, whose width follows the typed name both ways (backspace shrinks
+# it), so keep one panel and rebuild it when the size or color changes
+# instead of keeping a surface for every width ever seen
+_panel_cache = {"key": None, "panel": None}
+
+def cached_panel(size, color):
+    """A 'size' surface filled with the RGBA 'color', rebuilt only when either changes."""
+    key = (tuple(size), tuple(color))
+    if _panel_cache["key"] != key:
+        panel = pygame.Surface(key[0], pygame.SRCALPHA)
+        panel.fill(color)
+        _panel_cache["key"] = key
+        _panel_cache["panel"] = panel
+    return _panel_cache["panel"]
+
+font_style = get_font("bahnschrift", 25)
+score_font = get_font("comicsansms", 35)
 
 #Load and scale Sprites
+# Every rotation the snake renderer needs, keyed by (sprite name, angle).
+# Straight body pieces use 0/90 and the curves reuse the body sprite at 0/90/180/270.
+SPRITE_ANGLES = (0, 90, 180, 270)
+sprite_atlas = {}
+sprite_atlas_block = None  # snake_block the sprites were last scaled for
+SPRITE_NAMES = [name for name in IMAGES if name not in ("icon", "main_menu", "game_background")]
+# What a game draws, waited for behind the loading screen before it starts
+GAME_IMAGES = SPRITE_NAMES + ["game_background"]
+
+def build_sprite_atlas():
+    """Pre-rotates head, body and tail into all four orientations."""
+    global sprite_atlas
+    sprite_atlas = {}
+    for name, image in (("head", head_image), ("body", body_image), ("tail", tail_image)):
+        for angle in SPRITE_ANGLES:
+            sprite_atlas[name, angle] = pygame.transform.rotate(image, angle)
+
 def scale_sprites():
+    """Scales the sprites from the decoded images and rebuilds the atlas, only when snake_block changed."""
     global head_image, body_image, tail_image, food_image, food2_image, food3_image, food4_image, multiplier_image, divider_image, poison_image, antidote_image
-    head_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\snake_head.png").convert_alpha(), (snake_block, snake_block))
-    body_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\snake_body.png").convert_alpha(), (snake_block, snake_block))
-    tail_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\snake_tail.png").convert_alpha(), (snake_block, snake_block))
-    food_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\food.png").convert_alpha(), (snake_block, snake_block))
-    food2_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\food2.png").convert_alpha(), (snake_block, snake_block))
-    food3_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\food3.png").convert_alpha(), (snake_block, snake_block))
-    food4_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\food4.png").convert_alpha(), (snake_block, snake_block))
-    multiplier_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\egg.png").convert_alpha(), (snake_block, snake_block))
-    divider_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\divider.png").convert_alpha(), (snake_block, snake_block))
-    poison_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\poison.png").convert_alpha(), (snake_block, snake_block))
-    antidote_image = pygame.transform.scale(pygame.image.load(r"python\games\Snake\Assets\antidote.png").convert_alpha(), (snake_block, snake_block))
+    global sprite_atlas_block
+    if sprite_atlas_block == snake_block:
+        return
+    size = (snake_block, snake_block)
+    loading_screen(GAME_IMAGES)
+    head_image = assets.scaled("snake_head", size)
+    body_image = assets.scaled("snake_body", size)
+    tail_image = assets.scaled("snake_tail", size)
+    food_image = assets.scaled("food", size)
+    food2_image = assets.scaled("food2", size)
+    food3_image = assets.scaled("food3", size)
+    food4_image = assets.scaled("food4", size)
+    multiplier_image = assets.scaled("egg", size)
+    divider_image = assets.scaled("divider", size)
+    poison_image = assets.scaled("poison", size)
+    antidote_image = assets.scaled("antidote", size)
+    build_sprite_atlas()
+    sprite_atlas_block = snake_block
+
+def loading_screen(names):
+    """
+    Shows a progress bar until the images in 'names' are decoded. Returns
+    right away if they already are, which after startup is always.
+    """
+    while not assets.ready(names):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                quit()
+        done, total = assets.progress()
+        screen.fill(black)
+        bar = pygame.Rect(0, 0, width // 2, 20)
+        bar.center = (width // 2, height // 2)
+        pygame.draw.rect(screen, white, bar, 2)
+        pygame.draw.rect(screen, yellow, (bar.x + 4, bar.y + 4, (bar.width - 8) * done // total, bar.height - 8))
+        mesg, _ = cached_text("Loading...", font_style, white)
+        screen.blit(mesg, mesg.get_rect(midbottom=(width // 2, bar.y - 10)))
+        pygame.display.update()
+        clock.tick(MENU_FPS)
 
 def render_text_with_background(text, font, text_color, bg_color, position, center=False):
     """
@@ -87,8 +243,8 @@ def render_text_with_background(text, font, text_color, bg_color, position, cent
     :param center: Whether to center the text at the given position.
     :return: Rendered surface and its rectangle.
     """
-    # Render the text surface
-    text_surface = font.render(text, True, text_color)
+    # Text and background come from the cache, so repeated strings are just blits
+    text_surface, bg_surface = cached_text(text, font, text_color, bg_color)
     text_rect = text_surface.get_rect()
 
     if center:
@@ -96,10 +252,6 @@ def render_text_with_background(text, font, text_color, bg_color, position, cent
     else:
         text_rect.topleft = position
 
-    # Create a semi-transparent background surface
-    bg_surface = pygame.Surface((text_rect.width + 10, text_rect.height + 10), pygame.SRCALPHA)
-    bg_surface.fill(bg_color)  # Semi-transparent background
-
     # Draw background and then text
     screen.blit(bg_surface, (text_rect.x - 5, text_rect.y - 5))
     screen.blit(text_surface, text_rect.topleft)
@@ -114,11 +266,10 @@ def main_menu():
 
     while menu_running:
         # Scale the background image to fit the current resolution
-        scaled_bg = pygame.transform.scale(main_menu_bg, (width, height))
-        screen.blit(scaled_bg, (0, 0))  # Draw the background image
+        screen.blit(scaled_background("main_menu"), (0, 0))  # Draw the background image
 
         # Title or Game Image
-        title_font = pygame.font.SysFont("comicsansms", 50)
+        title_font = get_font("comicsansms", 50)
         render_text_with_background(
             "Snake Game",
             title_font,
@@ -129,7 +280,7 @@ def main_menu():
         )
 
         # Menu Options
-        options_font = pygame.font.SysFont("bahnschrift", 35)
+        options_font = get_font("bahnschrift", 35)
         option_positions.clear()  # Reset positions for hit detection
 
         for idx, option in enumerate(options):
@@ -152,7 +303,7 @@ def main_menu():
 
         pygame.display.update()
 
-        for event in pygame.event.get():
+        for event in wait_for_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
@@ -190,116 +341,119 @@ def main_menu():
                         pygame.quit()
                         quit()
 
-def our_snake(snake_list, x1_change, y1_change):
-    for i, segment in enumerate(snake_list[::-1]):
-        if i == 0:  # Head (last in original list)
-            if len(snake_list) == 1:  # Single-segment snake
-                if x1_change > 0:  # Moving right
-                    rotated_head = pygame.transform.rotate(head_image, 180)
-                elif x1_change < 0:  # Moving left
-                    rotated_head = pygame.transform.rotate(head_image, 0)
-                elif y1_change > 0:  # Moving down
-                    rotated_head = pygame.transform.rotate(head_image, 90)
-                elif y1_change < 0:  # Moving up
-                    rotated_head = pygame.transform.rotate(head_image, 270)
-                else:  # Default orientation if no movement yet
-                    rotated_head = head_image
-            else:  # Multi-segment snake
-                dx, dy = segment[0] - snake_list[-2][0], segment[1] - snake_list[-2][1]
-                if dx > 0:  # Moving right
-                    rotated_head = pygame.transform.rotate(head_image, 180)
-                elif dx < 0:  # Moving left
-                    rotated_head = pygame.transform.rotate(head_image, 0)
-                elif dy > 0:  # Moving down
-                    rotated_head = pygame.transform.rotate(head_image, 90)
-                elif dy < 0:  # Moving up
-                    rotated_head = pygame.transform.rotate(head_image, 270)
-            screen.blit(rotated_head, (segment[0], segment[1]))
-        elif i == len(snake_list) - 1:  # Tail (first in original list)
-            # Determine the direction of the tail
-            dx, dy = snake_list[1][0] - segment[0], snake_list[1][1] - segment[1]
-            if dx > 0:  # Tail pointing right
-                rotated_tail = pygame.transform.rotate(tail_image, 0)
-            elif dx < 0:  # Tail pointing left
-                rotated_tail = pygame.transform.rotate(tail_image, 180)
-            elif dy > 0:  # Tail pointing down
-                rotated_tail = pygame.transform.rotate(tail_image, 270)
-            elif dy < 0:  # Tail pointing up
-                rotated_tail = pygame.transform.rotate(tail_image, 90)
-            screen.blit(rotated_tail, (segment[0], segment[1]))
-        else:  # Body
-            # Determine the orientation of the body segment
-            prev_seg = snake_list[::-1][i - 1]
-            next_seg = snake_list[::-1][i + 1]
-            dx_prev, dy_prev = segment[0] - prev_seg[0], segment[1] - prev_seg[1]
-            dx_next, dy_next = next_seg[0] - segment[0], next_seg[1] - segment[1]
-
-            if (dx_prev == 0 and dx_next == 0) or (dy_prev == 0 and dy_next == 0):
-                # Straight body (horizontal or vertical)
-                if dx_prev != 0 or dx_next != 0:  # Horizontal
-                    rotated_body = pygame.transform.rotate(body_image, 0)
-                else:  # Vertical
-                    rotated_body = pygame.transform.rotate(body_image, 90)
-            else:
-                # Curved body
-                if (dx_prev > 0 and dy_next > 0) or (dx_next > 0 and dy_prev > 0):  # Bottom-left curve
-                    rotated_body = pygame.transform.rotate(body_image, 90)
-                elif (dx_prev < 0 and dy_next > 0) or (dx_next < 0 and dy_prev > 0):  # Bottom-right curve
-                    rotated_body = pygame.transform.rotate(body_image, 180)
-                elif (dx_prev > 0 and dy_next < 0) or (dx_next > 0 and dy_prev < 0):  # Top-left curve
-                    rotated_body = pygame.transform.rotate(body_image, 0)
-                elif (dx_prev < 0 and dy_next < 0) or (dx_next < 0 and dy_prev < 0):  # Top-right curve
-                    rotated_body = pygame.transform.rotate(body_image, 270)
-
-            screen.blit(rotated_body, (segment[0], segment[1]))
+def our_snake(snake_body, head_offset=(0, 0)):
+    """
+    Draws the snake in one pass, looking each segment's sprite up in the atlas.
+    The head is drawn 'head_offset' pixels away from its cell (see gameLoop).
+    """
+    blits = [(sprite_atlas[sprite], position) for position, sprite in snake_body.sprites()]
+    head_image, (head_x, head_y) = blits[-1]
+    blits[-1] = (head_image, (head_x + head_offset[0], head_y + head_offset[1]))
+    screen.blits(blits, False)
 
 def message(msg, color):
-    mesg = font_style.render(msg, True, color)
+    mesg, _ = cached_text(msg, font_style, color)
     screen.blit(mesg, [width / 6, height / 3])
 
 def display_score(score):
-    value = score_font.render(f"Score: {score}", True, yellow)
+    # Only re-rendered when the score changes
+    value, _ = cached_text(f"Score: {score}", score_font, yellow)
     screen.blit(value, [10, 10])
+    return value.get_rect(topleft=(10, 10))
 
-def load_highscores():
-    """Load high scores from a file."""
-    if not os.path.exists(HIGHSCORES_FILE):
-        return []
-    with open(HIGHSCORES_FILE, "r") as file:
-        scores = [line.strip() for line in file.readlines()]
-    return [(name, int(score)) for name, score in (entry.split(":") for entry in scores)]
-
-def save_highscores(scores):
-    """Save high scores to a file."""
-    with open(HIGHSCORES_FILE, "w") as file:
-        for name, score in scores:
-            file.write(f"{name}:{score}\n")
-
-def add_highscore(name, score):
-    """Add a new high score and keep only the top 10."""
-    scores = load_highscores()
-    scores.append((name, score))
-    scores = sorted(scores, key=lambda x: x[1], reverse=True)[:10]  # Keep top 10
-    save_highscores(scores)
-
-def reset_highscores():
-    """Reset the high scores."""
-    with open(HIGHSCORES_FILE, "w") as file:
-        file.write("")
+class DirtyRenderer:
+    """
+    Draws the game screen by only touching what changed since the last frame:
+    the snake cells reported by SnakeBody.take_dirty(), the old and new food
+    cells, the cells under the sliding head and the score. Those areas are
+    restored from the cached background, redrawn, and only their rects are
+    passed to pygame.display.update().
+    The first frame (and any frame after invalidate()) is drawn in full.
+    """
+
+    def __init__(self):
+        self.full_redraw = True
+        self.food = None
+        self.score = None
+        self.score_rect = None
+        self.head_rect = None
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def cell_rect(self, snake_body, cell):
+        x, y = snake_body.position(cell)
+        return pygame.Rect(x, y, snake_body.block, snake_body.block)
+
+    def draw(self, snake_body, foodx, foody, food_type, score, head_offset=(0, 0)):
+        background = scaled_background("game_background")
+        food = (foodx, foody, food_type)
+        head_cell = snake_body.cells[-1]
+        head_rect = self.cell_rect(snake_body, head_cell).move(head_offset)
+
+        if self.full_redraw:
+            screen.blit(background, (0, 0))
+            screen.blit(get_food_image(food_type), (foodx, foody))
+            our_snake(snake_body, head_offset)
+            self.head_rect = head_rect
+            self.score_rect = display_score(score)
+            snake_body.take_dirty()
+            self.full_redraw = False
+            self.food = food
+            self.score = score
+            pygame.display.update()
+            return
+
+        dirty = snake_body.take_dirty()
+        if food != self.food:
+            dirty.add(snake_body.cell_at(self.food[0], self.food[1]))
+        # The head can straddle two cells, so clear the ones under where it was and is
+        if head_rect != self.head_rect:
+            dirty.update(snake_body.cells_in(self.head_rect))
+            dirty.update(snake_body.cells_in(head_rect))
+
+        # Anything drawn over the score means the score goes back on top
+        rects = [self.cell_rect(snake_body, cell) for cell in dirty]
+        redraw_score = score != self.score or self.score_rect.collidelist(rects) != -1
+        if redraw_score:
+            for cell in snake_body.occupied_in(self.score_rect):
+                dirty.add(cell)
+            rects = [self.cell_rect(snake_body, cell) for cell in dirty]
+            rects.append(self.score_rect)
+
+        for rect in rects:
+            screen.blit(background, rect, rect)
+        food_rect = pygame.Rect(foodx, foody, snake_body.block, snake_body.block)
+        if food != self.food or food_rect.collidelist(rects) != -1:
+            screen.blit(get_food_image(food_type), food_rect)
+            rects.append(food_rect)
+            self.food = food
+        redraw_head = head_rect != self.head_rect or head_rect.collidelist(rects) != -1
+        dirty.discard(head_cell)
+        screen.blits([(sprite_atlas[sprite], position) for position, sprite in snake_body.sprites_in(dirty)], False)
+        if redraw_head:
+            screen.blit(sprite_atlas[snake_body.sprite_at(len(snake_body) - 1)], head_rect)
+            rects.append(head_rect)
+            self.head_rect = head_rect
+        if redraw_score:
+            self.score_rect = display_score(score)
+            rects.append(self.score_rect)
+            self.score = score
+
+        pygame.display.update(rects)
 
 def display_highscores():
     """Display the high scores screen."""
-    scores = load_highscores()
+    scores = high_scores.top()
     menu_running = True
     scroll_offset = 0
     r_key_held = False
     r_key_start_time = None  # Tracks the start time for holding the R key
 
     while menu_running:
-        scaled_bg = pygame.transform.scale(main_menu_bg, (width, height))
-        screen.blit(scaled_bg, (0, 0))  # Draw the background image
+        screen.blit(scaled_background("main_menu"), (0, 0))  # Draw the background image
 
-        title_font = pygame.font.SysFont("comicsansms", 50)
+        title_font = get_font("comicsansms", 50)
         render_text_with_background(
             "High Scores",
             title_font,
@@ -308,7 +462,7 @@ def display_highscores():
             (width / 2 - 150, 50)
         )
 
-        scores_font = pygame.font.SysFont("bahnschrift", 30)
+        scores_font = get_font("bahnschrift", 30)
         y_offset = 150 - scroll_offset
         for idx, (name, score) in enumerate(scores):
             # Name on the left at 25% width
@@ -328,7 +482,7 @@ def display_highscores():
                 (width * 0.75 - scores_font.size(str(score))[0], y_offset + idx * 30)
             )
 
-        back_font = pygame.font.SysFont("bahnschrift", 30)
+        back_font = get_font("bahnschrift", 30)
         render_text_with_background(
             "Press ESC to return to Main Menu",
             back_font,
@@ -359,13 +513,14 @@ def display_highscores():
                 center=True 
             )
             if remaining_time <= 0:  # Reset the high scores after 5 seconds
-                reset_highscores()
-                scores = []  # Clear the in-memory scores
+                high_scores.clear()
+                scores = []
                 r_key_held = False  # Reset the state
 
         pygame.display.update()
 
-        for event in pygame.event.get():
+        # Wake up every 100ms while the reset countdown runs, otherwise only on input
+        for event in wait_for_events(100 if r_key_held else 0):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
@@ -385,15 +540,13 @@ def display_highscores():
                     r_key_held = False
                     r_key_start_time = None
 
-def game_over_screen(score):
-    """Display the game over screen."""
+def game_over_screen(score, won=False):
+    """Display the game over screen ('won' when the snake filled the board)."""
     menu_running = True
-    scaled_bg = pygame.transform.scale(main_menu_bg, (width, height))
-    screen.blit(scaled_bg, (0, 0))  # Draw the background image
+    screen.blit(scaled_background("main_menu"), (0, 0))  # Draw the background image
 
     # Check if the score is a new high score
-    scores = load_highscores()
-    is_new_highscore = len(scores) < 5 or score > scores[-1][1]
+    is_new_highscore = high_scores.qualifies(score)
 
     # Input box for name entry
     input_box = pygame.Rect(width / 2 - 100, 250, 200, 50)
@@ -408,17 +561,16 @@ def game_over_screen(score):
     # Menu Options
     options = ["Play Again", "Quit to Main Menu"]
     selected_index = 0
-    options_font = pygame.font.SysFont("bahnschrift", 30)
+    options_font = get_font("bahnschrift", 30)
     option_positions = []
 
     while menu_running:
-        scaled_bg = pygame.transform.scale(main_menu_bg, (width, height))
-        screen.blit(scaled_bg, (0, 0))  # Draw the background image
+        screen.blit(scaled_background("main_menu"), (0, 0))  # Draw the background image
 
         # Draw Title
-        title_font = pygame.font.SysFont("comicsansms", 50)
+        title_font = get_font("comicsansms", 50)
         render_text_with_background(
-            "Game Over",
+            "You Win!" if won else "Game Over",
             title_font,
             yellow,
             (0, 0, 0, 150),
@@ -427,7 +579,7 @@ def game_over_screen(score):
         )
 
         # Display Final Score
-        score_font = pygame.font.SysFont("comicsansms", 35)
+        score_font = get_font("comicsansms", 35)
         render_text_with_background(
             f"Score: {score}",
             score_font,
@@ -438,7 +590,7 @@ def game_over_screen(score):
         )
 
         # Display Message for High Score or Not
-        message_font = pygame.font.SysFont("bahnschrift", 30)
+        message_font = get_font("bahnschrift", 30)
         if is_new_highscore:
             render_text_with_background(
                 "Congratulations, new HiScore!!",
@@ -460,10 +612,11 @@ def game_over_screen(score):
 
         # Draw Input Box if New HiScore
         if is_new_highscore:
-            input_box_bg = pygame.Surface((input_box.w + 10, input_box.h + 10), pygame.SRCALPHA)
-            input_box_bg.fill((0, 0, 0, 150))  # Semi-transparent black
+            input_box_bg = cached_panel((input_box.w + 10, input_box.h + 10), (0, 0, 0, 150))  # Semi-transparent black
             screen.blit(input_box_bg, (input_box.x - 5, input_box.y - 5))
 
+            # Every typed prefix is different, so render it directly rather
+            # than pushing the HUD and menu text out of the shared cache
             txt_surface = options_font.render(name, True, white)
             width_box = max(200, txt_surface.get_width() + 10)
             input_box.w = width_box
@@ -495,7 +648,8 @@ def game_over_screen(score):
 
         pygame.display.update()
 
-        for event in pygame.event.get():
+        # Wake up for the next cursor blink while typing, otherwise only on input
+        for event in wait_for_events(max(1, 500 - cursor_timer) if is_new_highscore and active else 0):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
@@ -508,11 +662,11 @@ def game_over_screen(score):
                 if event.button == 1:  # Left click
                     if option_positions[0].collidepoint(event.pos):  # Play Again
                         if is_new_highscore:
-                            add_highscore(name, score)
+                            high_scores.add(name, score)
                         return "play_again"
                     if option_positions[1].collidepoint(event.pos):  # Quit to Main Menu
                         if is_new_highscore:
-                            add_highscore(name, score)
+                            high_scores.add(name, score)
                         return "quit_to_menu"
                 if input_box.collidepoint(event.pos):  # Click on input box
                     active = not active
@@ -524,7 +678,7 @@ def game_over_screen(score):
                 if active:
                     if event.key == pygame.K_RETURN:
                         if is_new_highscore:
-                            add_highscore(name, score)
+                            high_scores.add(name, score)
                         return "quit_to_menu"
                     elif event.key == pygame.K_BACKSPACE:
                         name = name[:-1]
@@ -538,11 +692,11 @@ def game_over_screen(score):
                     elif event.key == pygame.K_RETURN:
                         if selected_index == 0:  # Play Again
                             if is_new_highscore:
-                                add_highscore(name, score)
+                                high_scores.add(name, score)
                             return "play_again"
                         elif selected_index == 1:  # Quit to Main Menu
                             if is_new_highscore:
-                                add_highscore(name, score)
+                                high_scores.add(name, score)
                             return "quit_to_menu"
 
 def toggle_fullscreen():
@@ -551,9 +705,9 @@ def toggle_fullscreen():
     if fullscreen:
         display_info = pygame.display.Info()  # Get native resolution
         width, height = display_info.current_w, display_info.current_h
-        screen = pygame.display.set_mode((width, height), pygame.NOFRAME | pygame.FULLSCREEN)
+        screen = set_display_mode((width, height), pygame.NOFRAME | pygame.FULLSCREEN)
     else:
-        screen = pygame.display.set_mode((width, height))
+        screen = set_display_mode((width, height))
 
 def settings_menu():
     global width, height, snake_block, snake_speed, screen, fullscreen
@@ -565,11 +719,10 @@ def settings_menu():
     current_speed = snake_speed
 
     while menu_running:
-        scaled_bg = pygame.transform.scale(main_menu_bg, (width, height))
-        screen.blit(scaled_bg, (0, 0))  # Draw the background image
+        screen.blit(scaled_background("main_menu"), (0, 0))  # Draw the background image
 
         # Title for Settings Menu
-        title_font = pygame.font.SysFont("comicsansms", 50)
+        title_font = get_font("comicsansms", 50)
         render_text_with_background(
             "Settings",
             title_font,
@@ -586,7 +739,7 @@ def settings_menu():
             f"Fullscreen: {'ON' if fullscreen else 'OFF'}",
             "Back to Main Menu"
         ]
-        options_font = pygame.font.SysFont("bahnschrift", 30)
+        options_font = get_font("bahnschrift", 30)
         option_positions = []
 
         for idx, option in enumerate(options):
@@ -603,7 +756,7 @@ def settings_menu():
 
         pygame.display.update()
 
-        for event in pygame.event.get():
+        for event in wait_for_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
@@ -617,42 +770,33 @@ def settings_menu():
                         current_resolution_index = (current_resolution_index + 1) % len(resolutions)
                         new_width, new_height = resolution_values[current_resolution_index]
                         width, height = new_width, new_height
-                        screen = pygame.display.set_mode((width, height), pygame.FULLSCREEN if fullscreen else 0)
+                        screen = set_display_mode((width, height), pygame.FULLSCREEN if fullscreen else 0)
                         snake_block = max(10, width // 64)  # Adjust snake block size proportionally
                         scale_sprites()
-                        config['SETTINGS']['width'] = str(width)
-                        config['SETTINGS']['height'] = str(height)
-                        config['SETTINGS']['snake_block'] = str(snake_block)
-                        save_config(config)
+                        settings.update(width=width, height=height, snake_block=snake_block)
                     elif selected_index == 1:  # Adjust Speed
                         current_speed = min(50, current_speed + 1)
                         snake_speed = current_speed
-                        config['SETTINGS']['snake_speed'] = str(snake_speed)
-                        save_config(config)
+                        settings.update(snake_speed=snake_speed)
                     elif selected_index == 2:  # Toggle Fullscreen
                         fullscreen = not fullscreen
                         display_info = pygame.display.Info()  # Get native resolution
                         width, height = display_info.current_w, display_info.current_h
-                        screen = pygame.display.set_mode((width, height), pygame.NOFRAME | pygame.FULLSCREEN if fullscreen else 0)
-                        config['SETTINGS']['fullscreen'] = str(fullscreen)
-                        save_config(config)
+                        screen = set_display_mode((width, height), pygame.NOFRAME | pygame.FULLSCREEN if fullscreen else 0)
+                        settings.update(fullscreen=fullscreen)
                 elif event.key in [pygame.K_LEFT, pygame.K_a]:  # Decrease resolution or settings
                     if selected_index == 0:  # Change Resolution
                         current_resolution_index = (current_resolution_index - 1) % len(resolutions)
                         new_width, new_height = resolution_values[current_resolution_index]
                         width, height = new_width, new_height
-                        screen = pygame.display.set_mode((width, height), pygame.FULLSCREEN if fullscreen else 0)
+                        screen = set_display_mode((width, height), pygame.FULLSCREEN if fullscreen else 0)
                         snake_block = max(10, width // 64)  # Adjust snake block size proportionally
                         scale_sprites()
-                        config['SETTINGS']['width'] = str(width)
-                        config['SETTINGS']['height'] = str(height)
-                        config['SETTINGS']['snake_block'] = str(snake_block)
-                        save_config(config)
+                        settings.update(width=width, height=height, snake_block=snake_block)
                     elif selected_index == 1:  # Adjust Speed
                         current_speed = max(1, current_speed - 1)
                         snake_speed = current_speed
-                        config['SETTINGS']['snake_speed'] = str(snake_speed)
-                        save_config(config)
+                        settings.update(snake_speed=snake_speed)
                 elif event.key in [pygame.K_RETURN, pygame.K_SPACE]:  # Select option
                     if selected_index == 3:  # Back to Main Menu
                         return
@@ -670,25 +814,20 @@ def settings_menu():
                             current_resolution_index = (current_resolution_index + 1) % len(resolutions)
                             new_width, new_height = resolution_values[current_resolution_index]
                             width, height = new_width, new_height
-                            screen = pygame.display.set_mode((width, height), pygame.FULLSCREEN if fullscreen else 0)
+                            screen = set_display_mode((width, height), pygame.FULLSCREEN if fullscreen else 0)
                             snake_block = max(10, width // 64)  # Adjust snake block size proportionally
                             scale_sprites()
-                            config['SETTINGS']['width'] = str(width)
-                            config['SETTINGS']['height'] = str(height)
-                            config['SETTINGS']['snake_block'] = str(snake_block)
-                            save_config(config)
+                            settings.update(width=width, height=height, snake_block=snake_block)
                         elif selected_index == 1:  # Adjust Speed
                             current_speed = min(50, current_speed + 1)
                             snake_speed = current_speed
-                            config['SETTINGS']['snake_speed'] = str(snake_speed)
-                            save_config(config)
+                            settings.update(snake_speed=snake_speed)
                         elif selected_index == 2:  # Toggle Fullscreen
                             fullscreen = not fullscreen
                             display_info = pygame.display.Info()  # Get native resolution
                             width, height = display_info.current_w, display_info.current_h
-                            screen = pygame.display.set_mode((width, height), pygame.NOFRAME | pygame.FULLSCREEN if fullscreen else 0)
-                            config['SETTINGS']['fullscreen'] = str(fullscreen)
-                            save_config(config)
+                            screen = set_display_mode((width, height), pygame.NOFRAME | pygame.FULLSCREEN if fullscreen else 0)
+                            settings.update(fullscreen=fullscreen)
                         elif selected_index == 3:  # Back to Main Menu
                             return
                 elif event.button == 3:  # Right click
@@ -697,18 +836,14 @@ def settings_menu():
                             current_resolution_index = (current_resolution_index - 1) % len(resolutions)
                             new_width, new_height = resolution_values[current_resolution_index]
                             width, height = new_width, new_height
-                            screen = pygame.display.set_mode((width, height), pygame.FULLSCREEN if fullscreen else 0)
+                            screen = set_display_mode((width, height), pygame.FULLSCREEN if fullscreen else 0)
                             snake_block = max(10, width // 64)  # Adjust snake block size proportionally
                             scale_sprites()
-                            config['SETTINGS']['width'] = str(width)
-                            config['SETTINGS']['height'] = str(height)
-                            config['SETTINGS']['snake_block'] = str(snake_block)
-                            save_config(config)
+                            settings.update(width=width, height=height, snake_block=snake_block)
                         elif selected_index == 1:  # Adjust Speed
                             current_speed = max(1, current_speed - 1)
                             snake_speed = current_speed
-                            config['SETTINGS']['snake_speed'] = str(snake_speed)
-                            save_config(config)
+                            settings.update(snake_speed=snake_speed)
 
 def gameLoop(debug=False):
     global snake_block, snake_speed
@@ -720,158 +855,199 @@ def gameLoop(debug=False):
         game_over = False
         game_close = False
         game_start = False
-        poisoned = False
-        poison_timer = 0
-
-        # Snake's initial position
-        x1 = width // 2
-        y1 = height // 2
-
-        # Initialize snake with a single segment
-        snake_List = [[x1, y1]]
-        Length_of_snake = 1
-        score = 0  # Separate variable to track the score
+        waiting_frame_drawn = False
 
-        # Place food randomly
-        foodx = random.randint(0, (width - snake_block) // snake_block) * snake_block
-        foody = random.randint(0, (height - snake_block) // snake_block) * snake_block
+        # The game itself, on the screen's pixel grid, with its own seeded RNG
+        # so the seed and the recorded moves replay it exactly
+        replay = Replay(random.getrandbits(32), width, height, snake_block, snake_speed)
+        sim = replay.new_sim()
+        snake_body = sim.body
 
-        # Determine the food type
-        food_type = "add_1"
+        # Redraws only what changed each tick (full frame first)
+        renderer = DirtyRenderer()
 
         # Debug initial values
         if debug:
             print("Game reset:")
-            print(f"Initial x1: {x1}, y1: {y1}")
-            print(f"Initial Snake List: {snake_List}")
-            print(f"Initial Food Position: {foodx}, {foody}")
-            print(f"Initial Food Type: {food_type}")
-
-        # Reset direction variables
-        x1_change = 0
-        y1_change = 0
+            print(f"Initial x1: {snake_body.head[0]}, y1: {snake_body.head[1]}")
+            print(f"Initial Snake List: {snake_body.positions()}")
+            print(f"Initial Food Position: {sim.food_position[0]}, {sim.food_position[1]}")
+            print(f"Initial Food Type: {sim.food_type}")
+            print(f"Seed: {replay.seed}")
+
+        # Fixed timestep: the snake moves snake_speed times per second of game
+        # time, however fast frames are drawn. Key presses wait in a short
+        # buffer so quick turns between two steps are not lost.
+        step_ms = 1000.0 / snake_speed
+        accumulator = 0.0
+        key_buffer = deque(maxlen=KEY_BUFFER_SIZE)
 
         while not game_over:
             # Handle "game close" state
             while game_close:
-                result = game_over_screen(score)
+                result = game_over_screen(sim.score, sim.won)
                 if result == "play_again":
                     return gameLoop(debug)
                 elif result == "quit_to_menu":
                     return
 
-            for event in pygame.event.get():
+            # Before the first key press the screen is static, so sleep until there is input
+            events = wait_for_events() if waiting_frame_drawn and not game_start else pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     quit()
+                if event.type == pygame.VIDEOEXPOSE:
+                    renderer.invalidate()  # the window contents were lost
                 if event.type == pygame.KEYDOWN:
-                    game_start = True  # Set the flag once a key is pressed
-                    if (event.key == pygame.K_LEFT or event.key == pygame.K_a) and x1_change == 0:
-                        x1_change = -snake_block
-                        y1_change = 0
-                    elif (event.key == pygame.K_RIGHT or event.key == pygame.K_d) and x1_change == 0:
-                        x1_change = snake_block
-                        y1_change = 0
-                    elif (event.key == pygame.K_UP or event.key == pygame.K_w) and y1_change == 0:
-                        y1_change = -snake_block
-                        x1_change = 0
-                    elif (event.key == pygame.K_DOWN or event.key == pygame.K_s) and y1_change == 0:
-                        y1_change = snake_block
-                        x1_change = 0
-
+                    if not game_start:
+                        # Set the flag once a key is pressed and take the first step right away
+                        game_start = True
+                        accumulator = step_ms
+                        clock.tick()
+                    if event.key in KEY_DIRECTIONS:
+                        key_buffer.append(KEY_DIRECTIONS[event.key])
+
+            foodx, foody = sim.food_position
             if not game_start:
                 # Draw the initial state of the game while waiting for input
-                scaled_bg = pygame.transform.scale(game_loop_bg, (width, height))
-                screen.blit(scaled_bg, (0, 0))  # Draw the background image
-                screen.blit(get_food_image(food_type), (foodx, foody))
-                our_snake(snake_List, x1_change, y1_change)
-                display_score(score)
+                screen.blit(scaled_background("game_background"), (0, 0))  # Draw the background image
+                screen.blit(get_food_image(sim.food_type), (foodx, foody))
+                our_snake(snake_body)
+                display_score(sim.score)
                 pygame.display.update()
+                waiting_frame_drawn = True
                 continue
 
-            # Update snake's head position
-            x1 += x1_change
-            y1 += y1_change
-
-            # Create the new head
-            snake_Head = [x1, y1]
-
-            # Check for boundary collision
-            if x1 >= width or x1 < 0 or y1 >= height or y1 < 0:
-                game_close = True
-                continue
-
-            # Check for self-collision only when the snake has more than one segment
-            if len(snake_List) > 1 and snake_Head in snake_List[:-1]:
-                game_close = True
-                continue
-
-            # Append new head to the snake
-            snake_List.append(snake_Head)
-
-            # Remove the oldest segment if necessary
-            if len(snake_List) > Length_of_snake:
-                del snake_List[0]
-
-            # Check if the snake eats the food
-            if x1 == foodx and y1 == foody:
-                if food_type.startswith("add_"):
-                    Length_of_snake += int(food_type[-1])  # Add corresponding length
-                    score += int(food_type[-1])  # Increase score
-                elif food_type == "multiplier":
-                    Length_of_snake *= 2
-                    score *= 2  # Double the score
-                elif food_type == "divider":
-                    Length_of_snake = max(1, Length_of_snake // 2)  # Reduce length but not below 1
-                    snake_List = snake_List[-Length_of_snake:]  # Visually truncate the snake
-                elif food_type == "poison":
-                    poisoned = True
-                elif food_type == "antidote":
-                    poisoned = False
-
-                # Respawn food
-                foodx = random.randint(0, (width - snake_block) // snake_block) * snake_block
-                foody = random.randint(0, (height - snake_block) // snake_block) * snake_block
-                food_type = get_random_food(poisoned)
-
-            # Handle poisoning effect
-            if poisoned:
-                poison_timer += clock.get_time()
-                if poison_timer >= 1000:  # Reduce length every second
-                    poison_timer = 0
-                    if Length_of_snake > 1:
-                        Length_of_snake -= 1
-                        score += 5
-                        del snake_List[0]  # Visually shorten the snake
-                    if Length_of_snake == 1:
-                        game_close = True
+            # Run every simulation step that is due (a few at most after a stall)
+            accumulator = min(accumulator, step_ms * MAX_STEPS_PER_FRAME)
+            while accumulator >= step_ms and not sim.done:
+                accumulator -= step_ms
+
+                # Take the first buffered turn that is allowed (no reversing onto yourself)
+                action = None
+                while key_buffer:
+                    direction = key_buffer.popleft()
+                    if sim.can_turn(direction):
+                        action = direction
+                        break
+                sim.step(action)
+                if sim.direction is not None:
+                    replay.record(sim.direction)
+            game_close = sim.done
+            if game_close and save_replays:
+                replay.finish(sim)
+                save_replay(replay)
 
             # Render the game elements
-            scaled_bg = pygame.transform.scale(game_loop_bg, (width, height))
-            screen.blit(scaled_bg, (0, 0))  # Draw the background image
-            screen.blit(get_food_image(food_type), (foodx, foody))
-            our_snake(snake_List, x1_change, y1_change)
-            display_score(score)  # Display the score
-            pygame.display.update()
+            draw_game(renderer, sim, accumulator / step_ms)
 
-            clock.tick(snake_speed)
+            accumulator += clock.tick(RENDER_FPS)
 
     # Cleanup after exiting
     pygame.quit()
     quit()
 
-# Helper functions for food
-def get_random_food(poisoned):
-    if poisoned:
-        return random.choices(
-            ["antidote", "add_4"], weights=[2, 1], k=1)[0]
-    return random.choices(
-        ["add_1", "add_2", "add_3", "add_4", "multiplier", "divider", "poison"],
-        weights=[6, 3, 2, 1, 1, 1, 1],
-        k=1
-    )[0]
+def draw_game(renderer, sim, progress):
+    """
+    Draws a frame of 'sim'. 'progress' (0..1) is how far time has got toward
+    the next step; the head slides from its last cell toward the current one
+    by that much.
+    """
+    head_offset = (0, 0)
+    if sim.direction is not None and not sim.done:
+        progress = min(1.0, progress)
+        dx, dy = DIR_VECTORS[sim.direction]
+        head_offset = (round((progress - 1.0) * dx * snake_block), round((progress - 1.0) * dy * snake_block))
+
+    foodx, foody = sim.food_position
+    if dirty_rects:
+        renderer.draw(sim.body, foodx, foody, sim.food_type, sim.score, head_offset)
+    else:
+        screen.blit(scaled_background("game_background"), (0, 0))  # Draw the background image
+        screen.blit(get_food_image(sim.food_type), (foodx, foody))
+        our_snake(sim.body, head_offset)
+        display_score(sim.score)  # Display the score
+        pygame.display.update()
 
+# Replays
+def save_replay(replay):
+    """
+    Writes 'replay' to REPLAY_DIR, named by the time, the score and the seed.
+    A replay that can't be written is reported and skipped; it never ends the game.
+    """
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}_{replay.score}_{replay.seed:08x}.snkr"
+    try:
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+        replay.save(os.path.join(REPLAY_DIR, name))
+    except (OSError, struct.error) as error:
+        print(f"Could not save replay {name}: {error}")
+
+def play_replay(replay, speed=1.0):
+    """
+    Plays a recorded game back on screen, 'speed' times as fast as it was
+    played. Up/Down double or halve the speed, Escape stops.
+    The window is switched to the replay's resolution for the playback.
+    """
+    global width, height, snake_block, screen
+    saved_mode = (width, height, snake_block)
+    replay_mode = (replay.width, replay.height, replay.snake_block)
+    flags = pygame.NOFRAME | pygame.FULLSCREEN if fullscreen else 0
+    if replay_mode != saved_mode:
+        width, height, snake_block = replay_mode
+        screen = set_display_mode((width, height), flags)
+    scale_sprites()
+
+    sim = replay.new_sim()
+    actions = replay.actions()
+    renderer = DirtyRenderer()
+    accumulator = 0.0
+    clock.tick()
+    playing = True
+    while playing:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                quit()
+            if event.type == pygame.VIDEOEXPOSE:
+                renderer.invalidate()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    playing = False
+                elif event.key in [pygame.K_UP, pygame.K_w]:
+                    speed = min(64.0, speed * 2)
+                elif event.key in [pygame.K_DOWN, pygame.K_s]:
+                    speed = max(0.125, speed / 2)
+
+        # Same fixed timestep as gameLoop, with the recorded moves as input
+        step_ms = 1000.0 / (replay.snake_speed * speed)
+        accumulator = min(accumulator, max(step_ms, 1000.0 / RENDER_FPS) * MAX_STEPS_PER_FRAME)
+        while accumulator >= step_ms and not sim.done:
+            accumulator -= step_ms
+            direction = next(actions, None)
+            if direction is None:
+                break  # the recording stopped before the game ended
+            sim.step(direction)
+
+        draw_game(renderer, sim, accumulator / step_ms)
+        if sim.done:
+            message("Replay finished, press any key", yellow)
+            pygame.display.update()
+            while playing:
+                for event in wait_for_events():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        quit()
+                    if event.type == pygame.KEYDOWN:
+                        playing = False
+        accumulator += clock.tick(RENDER_FPS)
+
+    if replay_mode != saved_mode:
+        width, height, snake_block = saved_mode
+        screen = set_display_mode((width, height), flags)
+    scale_sprites()
 
+# Helper functions for food
 def get_food_image(food_type):
     # Map food types to images
     food_images = {
@@ -887,6 +1063,26 @@ def get_food_image(food_type):
     return food_images.get(food_type, food_image)
 
 if __name__ == "__main__":
+    # python snake.py --replay FILE [--speed N] plays a recorded game back
+    parser = argparse.ArgumentParser(description="Danger Noodle")
+    parser.add_argument("--replay", help="replay file to play back")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    args = parser.parse_args()
+    replay = None
+    if args.replay:
+        try:
+            replay = Replay.load(args.replay)
+        except (OSError, ValueError) as e:
+            parser.error(f"can't play {args.replay}: {e}")
+    # The first screen only needs the icon and the menu background; the rest
+    # keep loading behind the menu
+    loading_screen(["icon", "main_menu"])
+    pygame.display.set_icon(assets.get("icon"))
+    if replay is not None:
+        play_replay(replay, args.speed)
+        pygame.quit()
+        quit()
+
     while True:
         choice = main_menu()
         if choice == "new_game":
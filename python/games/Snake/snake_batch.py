@@ -0,0 +1,216 @@
+# Many Snake games at once: the rules of SnakeSim on N boards held in NumPy
+# arrays, all advanced by one step() call. Meant for training agents and
+# balance sweeps where thousands of games run side by side.
+
+import numpy as np
+from snake_body import DIR_VECTORS
+from snake_sim import CAUSES, FOOD_TYPES, FOOD_WEIGHTS, POISONED_FOOD_TYPES, POISONED_FOOD_WEIGHTS
+
+# Every food type gets a code, its index in FOOD_NAMES
+FOOD_NAMES = FOOD_TYPES + [name for name in POISONED_FOOD_TYPES if name not in FOOD_TYPES]
+FOOD_GROWTH = np.array([int(name[-1]) if name.startswith("add_") else 0 for name in FOOD_NAMES], dtype=np.int64)
+MULTIPLIER = FOOD_NAMES.index("multiplier")
+DIVIDER = FOOD_NAMES.index("divider")
+POISON = FOOD_NAMES.index("poison")
+ANTIDOTE = FOOD_NAMES.index("antidote")
+
+def _food_table(names, weights):
+    """(codes, cumulative weights) for picking a food with np.searchsorted."""
+    return np.array([FOOD_NAMES.index(name) for name in names], dtype=np.int8), np.cumsum(weights)
+
+_FOOD_CODES, _FOOD_CUMULATIVE = _food_table(FOOD_TYPES, FOOD_WEIGHTS)
+_POISONED_CODES, _POISONED_CUMULATIVE = _food_table(POISONED_FOOD_TYPES, POISONED_FOOD_WEIGHTS)
+
+# SnakeSim.cause as a code, its index in CAUSES (-1 while a game runs)
+WALL = CAUSES.index("wall")
+BODY = CAUSES.index("body")
+POISONED_OUT = CAUSES.index("poison")
+WON = CAUSES.index("won")
+
+_DX = np.array([dx for dx, _ in DIR_VECTORS], dtype=np.int32)
+_DY = np.array([dy for _, dy in DIR_VECTORS], dtype=np.int32)
+
+
+class BatchSnakeSim:
+    """
+    N independent games on cols x rows boards. Cells are numbered
+    row * cols + col. Per board there is an occupancy grid, the body as a ring
+    buffer of cells (tail_ptr .. head_ptr), and the head, direction, target
+    length, score, food cell and food code (see FOOD_NAMES), poison state.
+    direction is -1 until the first turn, like SnakeSim's None, and cause is
+    -1 until the game ends, then the CAUSES index SnakeSim.cause would name.
+    Each step only touches the boards that move, and the per-board work is a
+    handful of array operations, so the cost per board falls as N grows.
+    Random picks come from one np.random.Generator seeded with 'seed'; games
+    follow the same rules as SnakeSim but not the same random sequence.
+    """
+
+    def __init__(self, n, cols, rows, seed=None, poison_steps=15):
+        self.n = n
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.poison_steps = poison_steps
+        self.rng = np.random.default_rng(seed)
+
+        self.grid = np.zeros((n, self.cells), dtype=np.uint8)
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int32)
+        self.tail_ptr = np.zeros(n, dtype=np.int32)
+        self.body_len = np.zeros(n, dtype=np.int32)
+        self.head = np.zeros(n, dtype=np.int32)
+        self.direction = np.full(n, -1, dtype=np.int8)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int32)
+        self.food_type = np.zeros(n, dtype=np.int8)
+        self.poisoned = np.zeros(n, dtype=bool)
+        self.poison_count = np.zeros(n, dtype=np.int32)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        self.cause = np.full(n, -1, dtype=np.int8)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Starts new games on the boards in 'mask' (all of them by default)."""
+        boards = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        if not len(boards):
+            return
+        start = self.rows // 2 * self.cols + self.cols // 2
+        self.grid[boards] = 0
+        self.grid[boards, start] = 1
+        self.body[boards, 0] = start
+        self.head_ptr[boards] = 0
+        self.tail_ptr[boards] = 0
+        self.body_len[boards] = 1
+        self.head[boards] = start
+        self.direction[boards] = -1
+        self.length[boards] = 1
+        self.score[boards] = 0
+        self.poisoned[boards] = False
+        self.poison_count[boards] = 0
+        self.steps[boards] = 0
+        self.done[boards] = False
+        self.won[boards] = False
+        self.cause[boards] = -1
+        # Food on any cell but the start one
+        food = self.rng.integers(0, self.cells - 1, size=len(boards))
+        self.food[boards] = food + (food >= start)
+        self.food_type[boards] = FOOD_NAMES.index("add_1")
+
+    def step(self, actions):
+        """
+        Advances every running board by one move. 'actions' holds a direction
+        code per board, or -1 (or a disallowed turn) to keep going straight.
+        Finished boards stay as they are until reset().
+        """
+        actions = np.asarray(actions)
+        running = ~self.done
+        turn = running & (actions >= 0) & ((self.direction < 0) | ((actions - self.direction) % 2 == 1))
+        self.direction[turn] = actions[turn]
+
+        # Move the heads of the boards that are under way
+        boards = np.flatnonzero(running & (self.direction >= 0))
+        direction = self.direction[boards]
+        col = self.head[boards] % self.cols + _DX[direction]
+        row = self.head[boards] // self.cols + _DY[direction]
+        inside = (col >= 0) & (col < self.cols) & (row >= 0) & (row < self.rows)
+        cell = np.where(inside, row * self.cols + col, 0)
+        # Walls, then the body (the tail hasn't moved out of its cell yet)
+        wall = ~inside
+        dead = wall | (self.grid[boards, cell] != 0)
+        self.done[boards[dead]] = True
+        self.cause[boards[dead]] = np.where(wall[dead], WALL, BODY)
+        boards = boards[~dead]
+        cell = cell[~dead]
+
+        head_ptr = (self.head_ptr[boards] + 1) % self.cells
+        self.body[boards, head_ptr] = cell
+        self.head_ptr[boards] = head_ptr
+        self.grid[boards, cell] = 1
+        self.body_len[boards] += 1
+        self.head[boards] = cell
+        self.steps[boards] += 1
+        # Boards already at their target length move their tail along
+        trim = boards[self.body_len[boards] > self.length[boards]]
+        self._drop_tails(trim, 1)
+
+        self._eat(boards[cell == self.food[boards]])
+
+        # Poison counts in steps; boards that just won are left alone
+        poisoned = boards[self.poisoned[boards] & ~self.done[boards]]
+        self.poison_count[poisoned] += 1
+        due = poisoned[self.poison_count[poisoned] >= self.poison_steps]
+        self.poison_count[due] = 0
+        shrink = due[self.length[due] > 1]
+        self.length[shrink] -= 1
+        self.score[shrink] += 5
+        self._drop_tails(shrink[self.body_len[shrink] > 1], 1)
+        starved = due[self.length[due] == 1]
+        self.done[starved] = True
+        self.cause[starved] = POISONED_OUT
+
+    def _eat(self, boards):
+        """Applies the food the heads of 'boards' are on and respawns it."""
+        if not len(boards):
+            return
+        food_type = self.food_type[boards]
+        growth = FOOD_GROWTH[food_type]
+        self.length[boards] += growth
+        self.score[boards] += growth
+        doubled = boards[food_type == MULTIPLIER]
+        self.length[doubled] *= 2
+        self.score[doubled] *= 2
+        halved = boards[food_type == DIVIDER]
+        self.length[halved] = np.maximum(1, self.length[halved] // 2)
+        self._drop_tails(halved, np.maximum(0, self.body_len[halved] - self.length[halved]))
+        self.poisoned[boards[food_type == POISON]] = True
+        self.poisoned[boards[food_type == ANTIDOTE]] = False
+
+        # Respawn on a random empty cell; none left means the board is full
+        free = self.cells - self.body_len[boards]
+        full = boards[free == 0]
+        self.won[full] = True
+        self.done[full] = True
+        self.cause[full] = WON
+        boards = boards[free > 0]
+        free = free[free > 0]
+        if not len(boards):
+            return
+        # The pick-th empty cell, counting along each board's grid
+        pick = (self.rng.random(len(boards)) * free).astype(np.int64)
+        empty_so_far = np.cumsum(self.grid[boards] == 0, axis=1)
+        self.food[boards] = np.argmax(empty_so_far > pick[:, None], axis=1)
+        self.food_type[boards] = self._random_food(self.poisoned[boards])
+
+    def _random_food(self, poisoned):
+        """Food codes for boards with the given poisoned flags, as random_food() picks them."""
+        roll = self.rng.random(len(poisoned))
+        codes = _FOOD_CODES[np.searchsorted(_FOOD_CUMULATIVE, roll * _FOOD_CUMULATIVE[-1], side="right")]
+        if poisoned.any():
+            poisoned_roll = roll[poisoned] * _POISONED_CUMULATIVE[-1]
+            codes[poisoned] = _POISONED_CODES[np.searchsorted(_POISONED_CUMULATIVE, poisoned_roll, side="right")]
+        return codes
+
+    def _drop_tails(self, boards, counts):
+        """Drops 'counts' (one number, or one per board) tail segments of 'boards'."""
+        if not len(boards):
+            return
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), boards.shape)
+        total = int(counts.sum())
+        if not total:
+            return
+        # One entry per dropped segment: its board and its offset from the tail
+        owners = np.repeat(boards, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        slots = (self.tail_ptr[owners] + offsets) % self.cells
+        self.grid[owners, self.body[owners, slots]] = 0
+        self.tail_ptr[boards] = (self.tail_ptr[boards] + counts) % self.cells
+        self.body_len[boards] -= counts.astype(np.int32)
+
+    def positions(self, board):
+        """(col, row) of each segment of one board, tail first."""
+        slots = (self.tail_ptr[board] + np.arange(self.body_len[board])) % self.cells
+        cells = self.body[board, slots]
+        return [(int(cell) % self.cols, int(cell) // self.cols) for cell in cells]
@@ -0,0 +1,246 @@
+# Snake body model: the segments plus one direction code per segment,
+# kept up to date as the head moves so drawing never has to look around.
+
+import random
+from collections import deque
+
+# Cells are packed into one int: row in the high bits, column in the low ones
+CELL_BITS = 16
+CELL_MASK = (1 << CELL_BITS) - 1
+
+def pack_cell(col, row):
+    return (row << CELL_BITS) | col
+
+def unpack_cell(cell):
+    """Returns (col, row) of a packed cell."""
+    return cell & CELL_MASK, cell >> CELL_BITS
+
+# Direction codes
+RIGHT, DOWN, LEFT, UP = range(4)
+DIR_VECTORS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+def direction_of(dx, dy):
+    """Direction code for a step of (dx, dy), or None if there is no movement."""
+    if dx > 0:
+        return RIGHT
+    if dx < 0:
+        return LEFT
+    if dy > 0:
+        return DOWN
+    if dy < 0:
+        return UP
+    return None
+
+# Sprite rotation for the head (by travel direction) and the tail (by the
+# direction it points toward the rest of the body)
+HEAD_ANGLES = {RIGHT: 180, LEFT: 0, DOWN: 90, UP: 270, None: 0}
+TAIL_ANGLES = {RIGHT: 0, LEFT: 180, DOWN: 270, UP: 90}
+
+def _body_angle(tail_side_dir, own_dir):
+    """
+    Rotation of a body segment given the direction code of the segment behind it
+    and its own (both pointing toward the head).
+    """
+    dx_prev, dy_prev = -DIR_VECTORS[own_dir][0], -DIR_VECTORS[own_dir][1]
+    dx_next, dy_next = -DIR_VECTORS[tail_side_dir][0], -DIR_VECTORS[tail_side_dir][1]
+
+    if (dx_prev == 0 and dx_next == 0) or (dy_prev == 0 and dy_next == 0):
+        # Straight body (horizontal or vertical)
+        return 0 if dx_prev != 0 or dx_next != 0 else 90
+    # Curved body
+    if (dx_prev > 0 and dy_next > 0) or (dx_next > 0 and dy_prev > 0):  # Bottom-left curve
+        return 90
+    if (dx_prev < 0 and dy_next > 0) or (dx_next < 0 and dy_prev > 0):  # Bottom-right curve
+        return 180
+    if (dx_prev > 0 and dy_next < 0) or (dx_next > 0 and dy_prev < 0):  # Top-left curve
+        return 0
+    return 270  # Top-right curve
+
+BODY_ANGLES = {(a, b): _body_angle(a, b) for a in range(4) for b in range(4)}
+
+
+class SnakeBody:
+    """
+    The snake's segments from tail to head, as packed grid cells in a deque,
+    plus the occupied cells (each mapped to a running serial number) so
+    collision checks and finding a cell's segment are O(1).
+    dirs[i] is the direction from segment i to the one in front of it; the
+    head's entry is the direction it last moved. Only the ends change when the
+    snake moves, so moving, growing, dropping the tail and the direction codes
+    are all O(1), and drawing is one pass.
+    Cells whose sprite changed are collected in 'dirty' for the renderer.
+    Positions go in and out as pixels; every segment sits on the same
+    'block'-sized grid as the starting one.
+    """
+
+    def __init__(self, x, y, block, free_cells=None):
+        self.block = block
+        self.origin = (x % block, y % block)
+        start = self.cell_at(x, y)
+        self.cells = deque([start])
+        self.dirs = deque([None])
+        self.occupied = {start: 0}  # cell -> serial, the tail has 'tail_serial'
+        self.tail_serial = 0
+        self.next_serial = 1
+        self.dirty = {start}
+        # Optional FreeCells of the board, kept in step with 'occupied'
+        self.free_cells = free_cells
+        if free_cells is not None:
+            free_cells.take(start)
+
+    def cell_at(self, x, y):
+        """Packed cell for the pixel position (x, y)."""
+        return pack_cell((x - self.origin[0]) // self.block, (y - self.origin[1]) // self.block)
+
+    def position(self, cell):
+        """Pixel position (x, y) of a packed cell."""
+        col, row = unpack_cell(cell)
+        return col * self.block + self.origin[0], row * self.block + self.origin[1]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, position):
+        """True if a segment is at the pixel position (x, y)."""
+        return self.cell_at(*position) in self.occupied
+
+    @property
+    def head(self):
+        return self.position(self.cells[-1])
+
+    def positions(self):
+        """Pixel positions of the segments, tail first."""
+        return [self.position(cell) for cell in self.cells]
+
+    def push_head(self, x, y):
+        """Adds a new head at (x, y), next to the current one."""
+        head_x, head_y = self.head
+        direction = direction_of(x - head_x, y - head_y)
+        cell = self.cell_at(x, y)
+        self.dirs[-1] = direction
+        self.dirty.add(self.cells[-1])  # the old head becomes a body piece
+        self.cells.append(cell)
+        self.dirs.append(direction)
+        self.occupied[cell] = self.next_serial
+        self.next_serial += 1
+        self.dirty.add(cell)
+        if self.free_cells is not None:
+            self.free_cells.take(cell)
+
+    def drop_tail(self):
+        cell = self.cells.popleft()
+        del self.occupied[cell]
+        self.tail_serial += 1
+        self.dirs.popleft()
+        self.dirty.add(cell)
+        if self.cells:
+            self.dirty.add(self.cells[0])  # the new tail
+        if self.free_cells is not None:
+            self.free_cells.free(cell)
+
+    def truncate(self, length):
+        """Keeps only the 'length' segments nearest the head."""
+        while len(self.cells) > length:
+            self.drop_tail()
+
+    def cells_in(self, rect):
+        """The grid cells, empty or not, that overlap the pixel rect 'rect'."""
+        origin_x, origin_y = self.origin
+        start_col = max(0, (rect.left - origin_x) // self.block)
+        end_col = (rect.right - 1 - origin_x) // self.block
+        start_row = max(0, (rect.top - origin_y) // self.block)
+        end_row = (rect.bottom - 1 - origin_y) // self.block
+        return [pack_cell(col, row) for row in range(start_row, end_row + 1)
+                for col in range(start_col, end_col + 1)]
+
+    def occupied_in(self, rect):
+        """The occupied cells that overlap the pixel rect 'rect'."""
+        return [cell for cell in self.cells_in(rect) if cell in self.occupied]
+
+    def take_dirty(self):
+        """Returns the cells changed since the last call and starts a new set."""
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
+
+    def sprite_at(self, i):
+        """(sprite name, angle) for segment 'i', counted from the tail."""
+        last = len(self.cells) - 1
+        if last == 0:
+            return "head", HEAD_ANGLES[self.dirs[0]]
+        if i == 0:
+            return "tail", TAIL_ANGLES[self.dirs[0]]
+        if i == last:
+            return "head", HEAD_ANGLES[self.dirs[i]]
+        return "body", BODY_ANGLES[self.dirs[i - 1], self.dirs[i]]
+
+    def sprites_in(self, cells):
+        """Yields ((x, y), (sprite name, angle)) for the segments on 'cells'; empty cells are skipped."""
+        for cell in cells:
+            serial = self.occupied.get(cell)
+            if serial is not None:
+                yield self.position(cell), self.sprite_at(serial - self.tail_serial)
+
+    def sprites(self):
+        """Yields ((x, y), (sprite name, angle)) for every segment, tail first."""
+        if len(self.cells) == 1:
+            yield self.head, ("head", HEAD_ANGLES[self.dirs[0]])
+            return
+        block = self.block
+        origin_x, origin_y = self.origin
+        last = len(self.cells) - 1
+        behind = None
+        for i, (cell, direction) in enumerate(zip(self.cells, self.dirs)):
+            position = ((cell & CELL_MASK) * block + origin_x, (cell >> CELL_BITS) * block + origin_y)
+            if i == 0:
+                yield position, ("tail", TAIL_ANGLES[direction])
+            elif i == last:
+                yield position, ("head", HEAD_ANGLES[direction])
+            else:
+                yield position, ("body", BODY_ANGLES[behind, direction])
+            behind = direction
+
+
+class FreeCells:
+    """
+    The empty cells of a cols x rows board: a list of packed cells plus each
+    cell's index in it. Taking a cell swaps the last one into its slot, so
+    take, free and picking a random empty cell are all O(1) however full the
+    board is.
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.cells = [pack_cell(col, row) for row in range(rows) for col in range(cols)]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def take(self, cell):
+        """Marks 'cell' as used. Cells off the board or already taken are ignored."""
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def free(self, cell):
+        """Marks 'cell' as empty again."""
+        col, row = unpack_cell(cell)
+        if cell in self.index or not (0 <= col < self.cols and 0 <= row < self.rows):
+            return
+        self.index[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def random_cell(self, rng=random):
+        """A uniformly random empty cell, or None when the board is full."""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
@@ -0,0 +1,193 @@
+import argparse
+import struct
+import time
+from snake_sim import CAUSES, SnakeSim
+
+# ---------------------------
+# Replays: the RNG seed, the game settings and the direction the snake went
+# on every step, run-length encoded. SnakeSim is deterministic, so that is
+# all it takes to play a game again exactly, headless or on screen (see
+# play_replay in snake.py).
+#
+#   python snake_replay.py verify replays/*.snkr
+#   python snake_replay.py info replays/20250101-120000_42.snkr
+# ---------------------------
+
+MAGIC = b"SNKR"
+VERSION = 1
+# magic, version, seed, width, height, snake_block, snake_speed,
+# then how the game ended: score, length, steps, cause
+HEADER = struct.Struct("<4sHIHHHHQIIB")
+# Multipliers double the score and length, so they can outgrow the header
+# fields; they are clamped to fit (as in snake_tournament.py)
+SCORE_MAX = 2 ** 64 - 1
+LENGTH_MAX = 2 ** 32 - 1
+NO_DIRECTION = 7  # stored in place of None while the snake hasn't moved
+DIRECTION_BITS = 3
+
+# ---------------------------
+# VARINTS
+# ---------------------------
+
+def write_varint(out, value):
+    """Appends 'value' to the bytearray 'out', 7 bits per byte, low bits first."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, offset):
+    """Returns (value, offset just past it). Raises ValueError if 'data' ends first."""
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated replay")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+# ---------------------------
+# REPLAY
+# ---------------------------
+
+class Replay:
+    """
+    One recorded game. 'runs' is a list of [steps, direction] pairs: the
+    snake went 'direction' (a direction code) for 'steps' steps in a row.
+    A game usually turns every few steps, so each run fits in one or two
+    bytes on disk and a ten minute game is a few kB.
+    The final score, length, steps and cause are kept too, so verify() can
+    tell whether the rules still play the game out the same way.
+    """
+
+    def __init__(self, seed, width, height, snake_block, snake_speed):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.snake_block = snake_block
+        self.snake_speed = snake_speed
+        self.runs = []
+        self.score = 0
+        self.length = 1
+        self.steps = 0
+        self.cause = None
+
+    def new_sim(self):
+        """A SnakeSim set up the way the recorded game started."""
+        return SnakeSim(self.width // self.snake_block, self.height // self.snake_block, seed=self.seed,
+                        poison_steps=self.snake_speed, block=self.snake_block)
+
+    def record(self, direction):
+        """Adds one step in which the snake went 'direction'."""
+        if self.runs and self.runs[-1][1] == direction:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, direction])
+
+    def finish(self, sim):
+        """Stores how the game in 'sim' ended, with score and length clamped to fit the file."""
+        self.score = min(sim.score, SCORE_MAX)
+        self.length = min(sim.length, LENGTH_MAX)
+        self.steps = sim.steps
+        self.cause = sim.cause
+
+    def actions(self):
+        """Yields the direction of every recorded step, in order."""
+        for steps, direction in self.runs:
+            for _ in range(steps):
+                yield direction
+
+    def to_bytes(self):
+        cause = CAUSES.index(self.cause) if self.cause is not None else len(CAUSES)
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.width, self.height, self.snake_block,
+                                    self.snake_speed, min(self.score, SCORE_MAX), min(self.length, LENGTH_MAX),
+                                    self.steps, cause))
+        write_varint(out, len(self.runs))
+        for steps, direction in self.runs:
+            code = NO_DIRECTION if direction is None else direction
+            write_varint(out, steps << DIRECTION_BITS | code)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("Not a replay: too short")
+        magic, version, seed, width, height, snake_block, snake_speed, score, length, steps, cause = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} replay")
+        replay = cls(seed, width, height, snake_block, snake_speed)
+        replay.score = score
+        replay.length = length
+        replay.steps = steps
+        replay.cause = CAUSES[cause] if cause < len(CAUSES) else None
+        count, offset = read_varint(data, HEADER.size)
+        for _ in range(count):
+            value, offset = read_varint(data, offset)
+            code = value & ((1 << DIRECTION_BITS) - 1)
+            replay.runs.append([value >> DIRECTION_BITS, None if code == NO_DIRECTION else code])
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def verify(replay):
+    """
+    Plays 'replay' headless as fast as possible. Returns True if it ends
+    exactly as recorded: on the last recorded step, with the same score,
+    length, steps and cause.
+    """
+    sim = replay.new_sim()
+    advance = sim.advance
+    for direction in replay.actions():
+        if sim.done:
+            return False  # ended before the recording did
+        advance(direction)
+    return (sim.done == (replay.cause is not None) and min(sim.score, SCORE_MAX) == replay.score
+            and min(sim.length, LENGTH_MAX) == replay.length and sim.steps == replay.steps
+            and sim.cause == replay.cause)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check or describe Snake replay files.")
+    parser.add_argument("command", choices=["verify", "info"])
+    parser.add_argument("replays", nargs="+")
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.replays:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ValueError) as e:
+            # A missing or half-written file counts as a failure, not a crash
+            failed += 1
+            print(f"{path}: BAD ({e})")
+            continue
+        if args.command == "info":
+            print(f"{path}: seed {replay.seed}, {replay.width}x{replay.height} block {replay.snake_block}, "
+                  f"speed {replay.snake_speed}, {replay.steps} steps in {len(replay.runs)} runs, "
+                  f"score {replay.score}, ended by {replay.cause}")
+            continue
+        start = time.perf_counter()
+        ok = verify(replay)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        failed += not ok
+        print(f"{path}: {'OK' if ok else 'MISMATCH'} ({replay.steps} steps in {elapsed_ms:.1f} ms)")
+    if failed:
+        raise SystemExit(f"{failed} of {len(args.replays)} replays could not be read or did not match")
+
+
+if __name__ == "__main__":
+    main()
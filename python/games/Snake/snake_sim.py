@@ -0,0 +1,164 @@
+# Headless Snake: the rules gameLoop() plays by, on a grid of cells with no
+# pygame and its own RNG, so games can be stepped, replayed and timed
+# without a display.
+
+import random
+from collections import namedtuple
+from snake_body import CELL_BITS, CELL_MASK, DIR_VECTORS, FreeCells, SnakeBody
+
+# ---------------------------
+# FOOD RULES
+# ---------------------------
+
+FOOD_TYPES = ["add_1", "add_2", "add_3", "add_4", "multiplier", "divider", "poison"]
+FOOD_WEIGHTS = [6, 3, 2, 1, 1, 1, 1]
+# While poisoned only these can spawn
+POISONED_FOOD_TYPES = ["antidote", "add_4"]
+POISONED_FOOD_WEIGHTS = [2, 1]
+
+def random_food(poisoned, rng=random):
+    """Picks the type of the next food."""
+    if poisoned:
+        return rng.choices(POISONED_FOOD_TYPES, weights=POISONED_FOOD_WEIGHTS, k=1)[0]
+    return rng.choices(FOOD_TYPES, weights=FOOD_WEIGHTS, k=1)[0]
+
+
+# ---------------------------
+# SIMULATION
+# ---------------------------
+
+# What step() returns. head and food are positions in 'block' units, length is
+# how long the snake is growing to (the body can still be shorter).
+SimState = namedtuple("SimState", "head length score food food_type poisoned done won")
+
+# The ways a game can end (SnakeSim.cause)
+CAUSES = ("wall", "body", "poison", "won")
+
+
+class SnakeSim:
+    """
+    One game of Snake on a cols x rows board, advanced one move per step().
+    Every random pick goes through 'rng' (a random.Random seeded with 'seed'
+    unless one is passed in), so the same seed and actions replay the same game.
+    Poison takes one length off every 'poison_steps' steps; gameLoop passes
+    snake_speed so that is once a second.
+    Positions are cell * block, so with block=1 they are plain cell coords and
+    gameLoop can use its pixel grid directly.
+    """
+
+    def __init__(self, cols, rows, seed=None, poison_steps=15, block=1, rng=None):
+        self.cols = cols
+        self.rows = rows
+        self.block = block
+        self.poison_steps = poison_steps
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Starts a new game: a one-cell snake in the middle, standing still."""
+        self.free_cells = FreeCells(self.cols, self.rows)
+        self.body = SnakeBody(self.cols // 2 * self.block, self.rows // 2 * self.block, self.block, self.free_cells)
+        self.direction = None  # RIGHT/DOWN/LEFT/UP once the first turn is taken
+        self.length = 1
+        self.score = 0
+        self.poisoned = False
+        self.poison_count = 0
+        self.steps = 0
+        self.done = False
+        self.won = False
+        self.cause = None  # why the game ended: "wall", "body", "poison" or "won"
+        self.food = self.free_cells.random_cell(self.rng)
+        self.food_type = "add_1"
+
+    @property
+    def food_position(self):
+        return self.body.position(self.food)
+
+    def can_turn(self, direction):
+        """A turn is allowed unless it is along the axis the snake already moves on."""
+        return self.direction is None or (direction - self.direction) % 2 == 1
+
+    def state(self):
+        return SimState(self.body.head, self.length, self.score, self.food_position,
+                        self.food_type, self.poisoned, self.done, self.won)
+
+    def step(self, action=None):
+        """
+        Turns toward direction code 'action' (None or a disallowed turn keeps
+        going straight), moves one cell and applies food and poison.
+        Before the first turn the snake stands still and nothing happens.
+        """
+        self.advance(action)
+        return self.state()
+
+    def advance(self, action=None):
+        """step() without building the returned state, for running games fast."""
+        if self.done or not self._move(action):
+            return
+        self.steps += 1
+        body = self.body
+
+        # Eating
+        if body.cells[-1] == self.food:
+            food_type = self.food_type
+            if food_type.startswith("add_"):
+                self.length += int(food_type[-1])
+                self.score += int(food_type[-1])
+            elif food_type == "multiplier":
+                self.length *= 2
+                self.score *= 2
+            elif food_type == "divider":
+                self.length = max(1, self.length // 2)
+                body.truncate(self.length)
+            elif food_type == "poison":
+                self.poisoned = True
+            elif food_type == "antidote":
+                self.poisoned = False
+
+            # Respawn on a random empty cell; none left means the board is full
+            food = self.free_cells.random_cell(self.rng)
+            if food is None:
+                self.won = True
+                self.done = True
+                self.cause = "won"
+                return
+            self.food = food
+            self.food_type = random_food(self.poisoned, self.rng)
+
+        # Poison counts in steps, so it is the same at any frame rate
+        if self.poisoned:
+            self.poison_count += 1
+            if self.poison_count >= self.poison_steps:
+                self.poison_count = 0
+                if self.length > 1:
+                    self.length -= 1
+                    self.score += 5
+                    if len(body) > 1:
+                        body.drop_tail()
+                if self.length == 1:
+                    self.done = True
+                    self.cause = "poison"
+
+    def _move(self, action):
+        """Moves the head one cell. Returns False if it stood still or died."""
+        if action is not None and self.can_turn(action):
+            self.direction = action
+        if self.direction is None:
+            return False
+        body = self.body
+        dx, dy = DIR_VECTORS[self.direction]
+        head = body.cells[-1]
+        col = (head & CELL_MASK) + dx
+        row = (head >> CELL_BITS) + dy
+        # Walls, then the body (the tail hasn't moved out of its cell yet)
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            self.cause = "wall"
+        elif (row << CELL_BITS | col) in body.occupied:
+            self.cause = "body"
+        if self.cause is not None:
+            self.done = True
+            return False
+        body.push_head(col * self.block + body.origin[0], row * self.block + body.origin[1])
+        if len(body) > self.length:
+            body.drop_tail()
+        return True
@@ -0,0 +1,303 @@
+import argparse
+import importlib
+import os
+import random
+import statistics
+import struct
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from snake_body import DIR_VECTORS, pack_cell, unpack_cell
+from snake_sim import CAUSES as SIM_CAUSES, SnakeSim
+
+# ---------------------------
+# Plays a Snake policy over a range of seeds on every core and sums up how
+# it did. Seeds are split into shards for a ProcessPoolExecutor; each shard
+# comes back as packed binary records which are appended to the results
+# file as they arrive, so an interrupted sweep picks up where it stopped.
+#
+#   python snake_tournament.py results.bin --policy safe_greedy --games 100000
+#   python snake_tournament.py results.bin --summary
+# ---------------------------
+
+# ---------------------------
+# POLICIES
+# ---------------------------
+# A policy is called as policy(sim, rng) before every step and returns a
+# direction code, or None to keep going. 'rng' is a random.Random of its own.
+
+def random_policy(sim, rng):
+    return rng.randrange(4)
+
+def greedy_policy(sim, rng):
+    """Heads straight for the food, ignoring walls and its own body."""
+    col, row = unpack_cell(sim.body.cells[-1])
+    food_col, food_row = unpack_cell(sim.food)
+    if food_col != col:
+        return DIR_VECTORS.index((1, 0) if food_col > col else (-1, 0))
+    return DIR_VECTORS.index((0, 1) if food_row > row else (0, -1))
+
+def safe_greedy_policy(sim, rng):
+    """The move closest to the food that doesn't hit a wall or the body next step."""
+    col, row = unpack_cell(sim.body.cells[-1])
+    food_col, food_row = unpack_cell(sim.food)
+    best = None
+    for direction, (dx, dy) in enumerate(DIR_VECTORS):
+        if not (direction == sim.direction or sim.can_turn(direction)):
+            continue
+        next_col, next_row = col + dx, row + dy
+        if not (0 <= next_col < sim.cols and 0 <= next_row < sim.rows):
+            continue
+        if pack_cell(next_col, next_row) in sim.body.occupied:
+            continue
+        option = (abs(food_col - next_col) + abs(food_row - next_row), rng.random(), direction)
+        if best is None or option < best:
+            best = option
+    return None if best is None else best[2]
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "safe_greedy": safe_greedy_policy,
+}
+
+def load_policy(name):
+    """A policy from POLICIES, or any function given as 'module:function'."""
+    if name in POLICIES:
+        return POLICIES[name]
+    if ":" not in name:
+        raise ValueError(f"Unknown policy '{name}' (use one of {', '.join(POLICIES)} or module:function)")
+    module_name, function_name = name.split(":", 1)
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+# ---------------------------
+# GAMES
+# ---------------------------
+
+# Why a game ended, stored as the index in this tuple; max_steps is a game
+# cut off by the step limit
+CAUSES = SIM_CAUSES + ("max_steps",)
+
+def play_game(policy, seed, cols, rows, poison_steps, max_steps):
+    """Plays one game. Returns (seed, score, length, steps, cause code)."""
+    sim = SnakeSim(cols, rows, seed=seed, poison_steps=poison_steps)
+    rng = random.Random(f"policy-{seed}")
+    while not sim.done and sim.steps < max_steps:
+        action = policy(sim, rng)
+        if sim.direction is None and action is None:
+            break  # a policy that never moves would never finish
+        sim.advance(action)
+    cause = CAUSES.index(sim.cause) if sim.done else CAUSES.index("max_steps")
+    return seed, sim.score, sim.length, sim.steps, cause
+
+def run_shard(policy_name, seeds, cols, rows, poison_steps, max_steps):
+    """Worker side: plays every seed in 'seeds' and returns the packed records."""
+    policy = load_policy(policy_name)
+    return b"".join(pack_record(*play_game(policy, seed, cols, rows, poison_steps, max_steps))
+                    for seed in seeds)
+
+
+# ---------------------------
+# RESULTS FILE
+# ---------------------------
+# A header with the settings (then the policy name), followed by one fixed
+# size record per finished game in the order they arrived.
+
+MAGIC = b"SNKT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHHIH")  # magic, version, cols, rows, poison_steps, max_steps, policy name length
+RECORD = struct.Struct("<QQIIB")  # seed, score, length, steps, cause
+SCORE_MAX = 2 ** 64 - 1  # multipliers can run the score up; it is clamped to fit
+UINT16_MAX = 2 ** 16 - 1
+UINT32_MAX = 2 ** 32 - 1
+SEED_MAX = 2 ** 64 - 1
+
+def pack_record(seed, score, length, steps, cause):
+    return RECORD.pack(seed, min(score, SCORE_MAX), min(length, UINT32_MAX), steps, cause)
+
+def write_header(file, settings):
+    name = settings["policy"].encode("utf-8")
+    file.write(HEADER.pack(MAGIC, VERSION, settings["cols"], settings["rows"],
+                           settings["poison_steps"], settings["max_steps"], len(name)) + name)
+
+def read_results(path):
+    """
+    Returns (settings, records, end) for a results file: 'end' is the offset
+    just past the last whole record, so a record cut short by a crash can be
+    dropped.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is too short to be a results file")
+    magic, version, cols, rows, poison_steps, max_steps, name_length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} tournament results file")
+    start = HEADER.size + name_length
+    settings = {
+        "policy": data[HEADER.size:start].decode("utf-8"),
+        "cols": cols,
+        "rows": rows,
+        "poison_steps": poison_steps,
+        "max_steps": max_steps,
+    }
+    count = (len(data) - start) // RECORD.size
+    end = start + count * RECORD.size
+    records = list(RECORD.iter_unpack(data[start:end]))
+    return settings, records, end
+
+def open_results(path, settings):
+    """
+    Opens 'path' for appending. A new file gets a header; an existing one must
+    have been written with the same settings. Returns (file, seeds already played).
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        file = open(path, "wb")
+        write_header(file, settings)
+        file.flush()
+        return file, set()
+    old_settings, records, end = read_results(path)
+    if old_settings != settings:
+        raise ValueError(f"{path} was written with different settings: {old_settings}")
+    file = open(path, "r+b")
+    file.truncate(end)
+    file.seek(end)
+    return file, {record[0] for record in records}
+
+
+# ---------------------------
+# TOURNAMENT
+# ---------------------------
+
+def run_tournament(path, settings, games, first_seed=0, workers=None, shard_size=200, progress=print):
+    """
+    Plays seeds first_seed .. first_seed + games - 1, skipping the ones already
+    in 'path', and appends each shard's records to it as soon as it finishes.
+    Returns the number of games played in this run.
+    """
+    load_policy(settings["policy"])  # fail here rather than in every worker
+    file, done = open_results(path, settings)
+    seeds = [seed for seed in range(first_seed, first_seed + games) if seed not in done]
+    shards = [seeds[i:i + shard_size] for i in range(0, len(seeds), shard_size)]
+    if done:
+        progress(f"Resuming: {len(done)} games already in {path}, {len(seeds)} to go")
+
+    played = 0
+    start = time.perf_counter()
+    with file, ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(run_shard, settings["policy"], shard, settings["cols"], settings["rows"],
+                               settings["poison_steps"], settings["max_steps"])
+                   for shard in shards]
+        try:
+            for future in as_completed(futures):
+                records = future.result()
+                file.write(records)
+                file.flush()
+                played += len(records) // RECORD.size
+                elapsed = time.perf_counter() - start
+                progress(f"{played}/{len(seeds)} games, {played / elapsed:,.0f} games/sec")
+        except KeyboardInterrupt:
+            # Everything written so far stays; run again to resume
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return played
+
+def summarize(records):
+    """Aggregate stats of a list of (seed, score, length, steps, cause) records."""
+    scores = sorted(record[1] for record in records)
+    deciles = statistics.quantiles(scores, n=10) if len(scores) > 1 else scores * 9
+    causes = Counter(CAUSES[record[4]] for record in records)
+    return {
+        "games": len(records),
+        "mean_score": statistics.fmean(scores),
+        "p10_score": deciles[0],
+        "median_score": statistics.median(scores),
+        "p90_score": deciles[-1],
+        "max_score": scores[-1],
+        "mean_length": statistics.fmean(record[2] for record in records),
+        "mean_steps": statistics.fmean(record[3] for record in records),
+        "causes": {cause: causes[cause] for cause in CAUSES},
+    }
+
+def score_histogram(records):
+    """Game counts per score bucket: 0, then powers of two (1, 2-3, 4-7, ...)."""
+    buckets = Counter(record[1].bit_length() for record in records)
+    return [(0 if bits == 0 else 1 << (bits - 1), (1 << bits) - 1, buckets[bits])
+            for bits in range(max(buckets) + 1)]
+
+def print_summary(settings, records):
+    if not records:
+        print("No games played yet")
+        return
+    summary = summarize(records)
+    print(f"Policy {settings['policy']} on {settings['cols']}x{settings['rows']}, "
+          f"poison every {settings['poison_steps']} steps, at most {settings['max_steps']} steps")
+    print(f"{summary['games']} games, score mean {summary['mean_score']:.1f}, "
+          f"p10 {summary['p10_score']:.0f}, median {summary['median_score']:.0f}, "
+          f"p90 {summary['p90_score']:.0f}, max {summary['max_score']}")
+    print(f"mean length {summary['mean_length']:.1f}, mean steps {summary['mean_steps']:.1f}")
+    print("ended by: " + ", ".join(f"{cause} {count / summary['games']:.1%}"
+                                   for cause, count in summary["causes"].items() if count))
+    histogram = score_histogram(records)
+    most = max(count for _, _, count in histogram)
+    for low, high, count in histogram:
+        label = f"{low}" if low == high else f"{low}-{high}"
+        print(f"{label:>14} {count:>8} {'#' * round(40 * count / most)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a Snake policy over many seeds on every core.")
+    parser.add_argument("results", help="results file, created or resumed")
+    parser.add_argument("--policy", default="safe_greedy", help=f"{', '.join(POLICIES)} or module:function")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--shard-size", type=int, default=200, help="games per task sent to a worker")
+    parser.add_argument("--cols", type=int, default=60)
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--poison-steps", type=int, default=15)
+    parser.add_argument("--max-steps", type=int, default=100000)
+    parser.add_argument("--summary", action="store_true", help="only print the results so far")
+    args = parser.parse_args()
+
+    # Everything that ends up in HEADER or RECORD has to fit its field; check
+    # here rather than after the workers have started
+    limits = [
+        ("--games", args.games, 0, SEED_MAX),
+        ("--first-seed", args.first_seed, 0, SEED_MAX - max(args.games, 1) + 1),
+        ("--shard-size", args.shard_size, 1, None),
+        ("--cols", args.cols, 1, UINT16_MAX),
+        ("--rows", args.rows, 1, UINT16_MAX),
+        ("--poison-steps", args.poison_steps, 1, UINT16_MAX),
+        ("--max-steps", args.max_steps, 1, UINT32_MAX),
+    ]
+    if args.workers is not None:
+        limits.append(("--workers", args.workers, 1, None))
+    for flag, value, low, high in limits:
+        if value < low or (high is not None and value > high):
+            parser.error(f"{flag} must be at least {low}" + (f" and at most {high}" if high is not None else ""))
+    if len(args.policy.encode("utf-8")) > UINT16_MAX:
+        parser.error(f"--policy name must be at most {UINT16_MAX} bytes")
+
+    if not args.summary:
+        settings = {
+            "policy": args.policy,
+            "cols": args.cols,
+            "rows": args.rows,
+            "poison_steps": args.poison_steps,
+            "max_steps": args.max_steps,
+        }
+        try:
+            run_tournament(args.results, settings, args.games, args.first_seed, args.workers, args.shard_size)
+        except ValueError as error:
+            parser.error(str(error))
+    try:
+        settings, records, _ = read_results(args.results)
+    except (OSError, ValueError) as error:
+        parser.error(f"can't read {args.results}: {error}")
+    print_summary(settings, records)
+
+
+if __name__ == "__main__":
+    main()